@@ -0,0 +1,231 @@
+"""
+Local stand-ins for the services the pipeline talks to, for offline benchmarks.
+
+- ExophaseFixture: paginated /public/player/<id>/games API with configurable
+  latency, library size and injected 429 responses.
+- StoreFixture: Nintendo store search and product pages shaped like the live
+  ones (product links with square art, product page with a w_<n> hero image)
+  plus an /images/ CDN that serves a small JPEG corpus.
+"""
+
+import io
+import json
+import random
+import re
+import threading
+import time
+import http.server
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlparse, parse_qs
+
+try:
+    from PIL import Image, ImageDraw
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+
+# Same page size as the live API
+PAGE_SIZE = 50
+
+
+def format_playtime(minutes: int) -> str:
+    """Exophase-style playtime, e.g. "11h 4m" or "42m" """
+    return f"{minutes // 60}h {minutes % 60}m" if minutes >= 60 else f"{minutes}m"
+
+
+def playtime_minutes(playtime: str) -> int:
+    h = re.search(r"(\d+)h", playtime)
+    m = re.search(r"(\d+)m", playtime)
+    return (int(h.group(1)) * 60 if h else 0) + (int(m.group(1)) if m else 0)
+
+
+def synthetic_games(count: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """Games shaped like Exophase API entries"""
+    rng = random.Random(seed)
+    now = int(time.time())
+    games = []
+    for i in range(count):
+        minutes = rng.randint(1, 6000)
+        games.append({
+            "meta": {"title": f"Synthetic Game {i:05d}"},
+            "playtime": format_playtime(minutes),
+            "resource_standard": f"https://m.exophase.com/nintendo/games/m/{i:05d}.png",
+            "lastplayed_utc": now - rng.randint(0, 3 * 365 * 86400),
+        })
+    return games
+
+
+def synthetic_rows(count: int, seed: int = 0) -> List[Dict[str, str]]:
+    """Rows shaped like docs/games.json"""
+    return [
+        {
+            "title": g["meta"]["title"],
+            "playtime": g["playtime"],
+            "image_url": g["resource_standard"],
+            "last_played": str(g["lastplayed_utc"]),
+        }
+        for g in synthetic_games(count, seed)
+    ]
+
+
+def image_corpus(count: int = 8, size=(1920, 1080), seed: int = 0) -> List[bytes]:
+    """Distinct JPEGs with enough structure to be realistic to decode"""
+    if not PIL_AVAILABLE:
+        raise RuntimeError("Pillow is required to generate the image corpus")
+    rng = random.Random(seed)
+    corpus = []
+    for _ in range(count):
+        img = Image.new("RGB", size, tuple(rng.randint(0, 255) for _ in range(3)))
+        draw = ImageDraw.Draw(img)
+        for _ in range(60):
+            x0, y0 = rng.randint(0, size[0]), rng.randint(0, size[1])
+            x1, y1 = x0 + rng.randint(20, size[0] // 3), y0 + rng.randint(20, size[1] // 3)
+            draw.rectangle((x0, y0, x1, y1), fill=tuple(rng.randint(0, 255) for _ in range(3)))
+        buf = io.BytesIO()
+        img.save(buf, "JPEG", quality=88)
+        img.close()
+        corpus.append(buf.getvalue())
+    return corpus
+
+
+class _QuietHandler(http.server.BaseHTTPRequestHandler):
+    # Keep-alive, like the live services; without TCP_NODELAY, the separate header
+    # and body writes stall on delayed ACKs
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_body(self, code: int, body: bytes, content_type: str, headers: Optional[Dict[str, str]] = None):
+        self.send_response(code)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class _Fixture:
+    """Runs a handler on an ephemeral localhost port in a background thread"""
+
+    handler_class = _QuietHandler
+
+    def __enter__(self):
+        handler = type("Handler", (self.handler_class,), {"fixture": self})
+        self.server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+class _ExophaseHandler(_QuietHandler):
+    def do_GET(self):
+        fixture = self.fixture
+        if fixture.latency:
+            time.sleep(fixture.latency)
+        with fixture.lock:
+            fixture.requests += 1
+            throttled = fixture.rng.random() < fixture.error_rate
+        if throttled:
+            self.send_body(429, b'{"success":false}', "application/json", {"Retry-After": "0"})
+            return
+
+        query = parse_qs(urlparse(self.path).query)
+        page = int(query.get("page", ["1"])[0])
+        start = (page - 1) * PAGE_SIZE
+        with fixture.lock:
+            games = fixture.games
+            if query.get("sort", [""])[0] == fixture.recent_sort:
+                games = sorted(games, key=lambda g: g["lastplayed_utc"], reverse=True)
+            body = json.dumps({"success": True, "games": games[start:start + PAGE_SIZE]}).encode("utf-8")
+        self.send_body(200, body, "application/json; charset=utf-8")
+
+
+class ExophaseFixture(_Fixture):
+    handler_class = _ExophaseHandler
+
+    def __init__(self, games: List[Dict[str, Any]], latency: float = 0.02,
+                 error_rate: float = 0.0, seed: int = 0):
+        self.games = games
+        self.latency = latency
+        self.error_rate = error_rate
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.requests = 0
+        # Sort value answered most-recently-played first (scrape_exophase.POLL_SORT)
+        self.recent_sort = "1"
+
+    def play(self, index: int, minutes: int = 5) -> None:
+        """Simulate a play session: bump last played time and playtime of one game"""
+        with self.lock:
+            game = dict(self.games[index])
+            game["lastplayed_utc"] = int(time.time())
+            game["playtime"] = format_playtime(playtime_minutes(game["playtime"]) + minutes)
+            self.games = self.games[:index] + [game] + self.games[index + 1:]
+
+    @property
+    def base_url(self) -> str:
+        # Drop-in replacement for scrape_exophase.BASE_URL
+        return f"{self.url}/public/player/1/games?environment=nintendo&sort=5&showHidden=0"
+
+
+class _StoreHandler(_QuietHandler):
+    def do_GET(self):
+        fixture = self.fixture
+        if fixture.latency:
+            time.sleep(fixture.latency)
+        path = urlparse(self.path).path
+        if path.startswith("/images/"):
+            try:
+                index = int(path.rsplit("/", 1)[1].split(".")[0])
+            except ValueError:
+                self.send_body(404, b"", "text/plain")
+                return
+            body = fixture.corpus[index % len(fixture.corpus)]
+            self.send_body(200, body, "image/jpeg")
+        elif path.startswith("/us/search"):
+            self.send_body(200, fixture.search_page().encode("utf-8"), "text/html; charset=utf-8")
+        elif path.startswith("/us/store/products/"):
+            slug = path.rstrip("/").rsplit("/", 1)[1]
+            self.send_body(200, fixture.product_page(slug).encode("utf-8"), "text/html; charset=utf-8")
+        else:
+            self.send_body(404, b"", "text/plain")
+
+
+class StoreFixture(_Fixture):
+    handler_class = _StoreHandler
+
+    def __init__(self, corpus: List[bytes], results: int = 10, latency: float = 0.0):
+        self.corpus = corpus
+        self.results = results
+        self.latency = latency
+
+    def search_page(self) -> str:
+        # Static results regardless of query; the live page fills these in client-side
+        items = "\n".join(
+            f'<a href="/us/store/products/game-{i}/"><img src="/images/{i}.jpg?w_400">'
+            f'<h3 class="title">Synthetic Game {i:05d}</h3></a>'
+            for i in range(self.results)
+        )
+        return f"<html><head><title>Search</title></head><body><div class=\"search-results\">{items}</div></body></html>"
+
+    def product_page(self, slug: str) -> str:
+        index = slug.rsplit("-", 1)[-1]
+        icons = "".join(f'<img src="/images/ncom/icon-{i}.png?w_24" alt="">' for i in range(10))
+        return (
+            f"<html><head><title>{slug}</title></head><body>{icons}"
+            f'<div class="hero"><img src="{self.url}/images/{index}.jpg?ncom/software/w_1024" alt="hero"></div>'
+            "</body></html>"
+        )
@@ -0,0 +1,364 @@
+#!/usr/bin/env python3
+"""
+Offline benchmarks for each pipeline stage against local fixture servers.
+
+Stages:
+    exophase   scrape_exophase.main against a paginated fake Exophase API
+    daemon     scrape_exophase.poll_target polls, with play sessions between them
+    store      search_nintendo_store + get_game_page_images (needs Chrome/ChromeDriver)
+    download   nintendo_image_scraper.download_image from a local image CDN
+    transcode  batch_scraper.convert_images on a synthetic JPEG corpus
+    serve      serve_games.GamesRequestHandler under concurrent clients
+
+Each stage runs at every library size in its own process, so peak RSS is
+per stage. Results (throughput, latency percentiles, peak RSS) are written
+as JSON; pass --compare with an earlier results file to see regressions.
+
+    python bench/run_benchmarks.py --sizes 100,1000 --out bench.json
+    python bench/run_benchmarks.py --compare bench.json
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+import contextlib
+import functools
+import threading
+import multiprocessing
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(BENCH_DIR)
+for path in (BENCH_DIR, REPO_ROOT, os.path.join(REPO_ROOT, "scraper")):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+import metrics
+import fixtures
+
+STAGES = ["exophase", "daemon", "store", "download", "transcode", "serve"]
+
+# Polls per daemon run; every other one follows a simulated play session
+DAEMON_POLLS = 40
+
+# Distinct images in the synthetic corpus; larger libraries reuse them under new names
+CORPUS_SIZE = 16
+
+
+class StageSkipped(Exception):
+    pass
+
+
+def _require(module: str) -> Any:
+    try:
+        return __import__(module)
+    except ImportError as e:
+        raise StageSkipped(f"{module} not importable: {e}")
+
+
+def bench_exophase(size: int, options: Dict[str, Any], workdir: str) -> Dict[str, Any]:
+    import scrape_exophase
+
+    with fixtures.ExophaseFixture(fixtures.synthetic_games(size), latency=options["latency"],
+                                  error_rate=options["error_rate"]) as api:
+        scrape_exophase.BASE_URL = api.base_url
+        scrape_exophase.PAGE_DELAY = 0
+        scrape_exophase.RATE_LIMIT.interval = 0
+        out_path = os.path.join(workdir, "games.json")
+        start = time.perf_counter()
+        scrape_exophase.main(["scrape_exophase.py", out_path])
+        elapsed = time.perf_counter() - start
+        requests_made = api.requests
+
+    return {"seconds": elapsed, "items": size, "requests": requests_made, "timer": "exophase.page_fetch"}
+
+
+def bench_daemon(size: int, options: Dict[str, Any], workdir: str) -> Dict[str, Any]:
+    import scrape_exophase
+
+    with fixtures.ExophaseFixture(fixtures.synthetic_games(size), latency=options["latency"]) as api:
+        scrape_exophase.PAGE_DELAY = 0
+        scrape_exophase.RATE_LIMIT.interval = 0
+        target = {
+            "label": "", "base_url": api.base_url, "out_path": os.path.join(workdir, "games.json"),
+            "rows": [], "next_full": 0, "full_refresh": 86400, "warned": False,
+        }
+        # Initial full scrape, as the daemon does when there is no data yet
+        scrape_exophase.poll_target(target, api.recent_sort)
+
+        changes = 0
+        start = time.perf_counter()
+        for i in range(DAEMON_POLLS):
+            played = i % 2 == 0
+            if played:
+                api.play((i * 7919) % size)
+            with metrics.timer("bench.daemon_poll"):
+                changed = scrape_exophase.poll_target(target, api.recent_sort)
+            if changed != played:
+                raise RuntimeError(f"poll {i}: expected changed={played}, got {changed}")
+            changes += changed
+        elapsed = time.perf_counter() - start
+
+    return {"seconds": elapsed, "items": DAEMON_POLLS, "changes": changes, "timer": "bench.daemon_poll"}
+
+
+def bench_store(size: int, options: Dict[str, Any], workdir: str) -> Dict[str, Any]:
+    _require("selenium")
+    import nintendo_image_scraper as scraper
+
+    count = min(size, options["store_limit"])
+    corpus = fixtures.image_corpus(CORPUS_SIZE, size=(640, 360))
+    with fixtures.StoreFixture(corpus) as store:
+        scraper.STORE_URL = store.url
+        driver = scraper.setup_driver()
+        if not driver:
+            raise StageSkipped("Chrome driver not available")
+        try:
+            start = time.perf_counter()
+            for i in range(count):
+                results = scraper.search_nintendo_store(driver, f"Synthetic Game {i:05d}")
+                if results:
+                    scraper.get_game_page_images(driver, results[i % len(results)]["link"])
+            elapsed = time.perf_counter() - start
+        finally:
+            driver.quit()
+    return {"seconds": elapsed, "items": count, "timer": "images.search"}
+
+
+def bench_download(size: int, options: Dict[str, Any], workdir: str) -> Dict[str, Any]:
+    _require("requests")
+    _require("selenium")
+    import nintendo_image_scraper as scraper
+
+    corpus = fixtures.image_corpus(CORPUS_SIZE)
+    with fixtures.StoreFixture(corpus, latency=options["latency"]) as store:
+        start = time.perf_counter()
+        for i in range(size):
+            target = os.path.join(workdir, f"{i % CORPUS_SIZE}_main.jpg")
+            scraper.download_image(f"{store.url}/images/{i}.jpg", target)
+        elapsed = time.perf_counter() - start
+    total_bytes = sum(len(corpus[i % CORPUS_SIZE]) for i in range(size))
+    return {"seconds": elapsed, "items": size, "bytes": total_bytes, "timer": "images.download"}
+
+
+def _fill_dir(directory: str, corpus: List[bytes], count: int, suffix: str) -> None:
+    """Write count images named like scraper output, hardlinking repeats of the corpus"""
+    os.makedirs(directory, exist_ok=True)
+    originals = []
+    for i, data in enumerate(corpus):
+        path = os.path.join(directory, f"synthetic_game_{i:05d}{suffix}")
+        with open(path, "wb") as f:
+            f.write(data)
+        originals.append(path)
+    for i in range(len(corpus), count):
+        path = os.path.join(directory, f"synthetic_game_{i:05d}{suffix}")
+        try:
+            os.link(originals[i % len(originals)], path)
+        except OSError:
+            shutil.copyfile(originals[i % len(originals)], path)
+
+
+def bench_transcode(size: int, options: Dict[str, Any], workdir: str) -> Dict[str, Any]:
+    _require("PIL")
+    _require("selenium")
+    import batch_scraper
+
+    square_dir = os.path.join(workdir, "square")
+    _fill_dir(square_dir, fixtures.image_corpus(CORPUS_SIZE, size=(1024, 1024)), size, "_square.jpg")
+    start = time.perf_counter()
+    converted = batch_scraper.convert_images(square_dir, os.path.join(workdir, "square-converted"),
+                                             (512, 512), workers=options["workers"])
+    elapsed = time.perf_counter() - start
+    return {"seconds": elapsed, "items": converted, "timer": "images.transcode"}
+
+
+def bench_serve(size: int, options: Dict[str, Any], workdir: str) -> Dict[str, Any]:
+    import socketserver
+    import serve_games
+
+    docs = os.path.join(workdir, "docs")
+    os.makedirs(docs)
+    with open(os.path.join(docs, "games.json"), "w", encoding="utf-8") as f:
+        json.dump(fixtures.synthetic_rows(size), f)
+    _fill_dir(os.path.join(docs, "images", "main"), fixtures.image_corpus(CORPUS_SIZE), CORPUS_SIZE, "_main.jpg")
+
+    class Server(socketserver.ThreadingMixIn, socketserver.TCPServer):
+        daemon_threads = True
+        allow_reuse_address = True
+        request_queue_size = 128
+
+    class Handler(serve_games.GamesRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+    server = Server(("127.0.0.1", 0), functools.partial(Handler, directory=docs))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    paths = ["/games.json"] + [f"/images/main/synthetic_game_{i:05d}_main.jpg" for i in range(CORPUS_SIZE)]
+
+    def fetch(i: int) -> int:
+        with metrics.timer("bench.client_request"):
+            with urllib.request.urlopen(base + paths[i % len(paths)], timeout=30) as resp:
+                return len(resp.read())
+
+    try:
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options["clients"]) as pool:
+            total_bytes = sum(pool.map(fetch, range(size)))
+        elapsed = time.perf_counter() - start
+    finally:
+        server.shutdown()
+        server.server_close()
+    return {"seconds": elapsed, "items": size, "bytes": total_bytes, "timer": "bench.client_request"}
+
+
+BENCHMARKS = {
+    "exophase": bench_exophase,
+    "daemon": bench_daemon,
+    "store": bench_store,
+    "download": bench_download,
+    "transcode": bench_transcode,
+    "serve": bench_serve,
+}
+
+
+def _peak_rss_mb() -> Optional[float]:
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def _run_stage(stage: str, size: int, options: Dict[str, Any], queue: Any) -> None:
+    """Child process entry point; puts one result dict on the queue"""
+    result: Dict[str, Any] = {"stage": stage, "size": size}
+    workdir = tempfile.mkdtemp(prefix=f"bench-{stage}-")
+    try:
+        # Keep per-item prints from the pipeline out of the report
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            raw = BENCHMARKS[stage](size, options, workdir)
+        timings = metrics.summary()["timers"].get(raw.pop("timer"), {})
+        seconds = raw.pop("seconds")
+        result.update({
+            "status": "ok",
+            "seconds": round(seconds, 4),
+            "throughput": round(raw["items"] / seconds, 2) if seconds else None,
+            "latency": {k: timings.get(k) for k in ("count", "p50", "p90", "p99", "max")},
+            **raw,
+        })
+    except StageSkipped as e:
+        result.update({"status": "skipped", "reason": str(e)})
+    except BaseException as e:
+        result.update({"status": "error", "reason": f"{type(e).__name__}: {e}"})
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    result["peak_rss_mb"] = _peak_rss_mb()
+    queue.put(result)
+
+
+def run(stages: List[str], sizes: List[int], options: Dict[str, Any]) -> Dict[str, Any]:
+    ctx = multiprocessing.get_context("spawn")
+    results = []
+    for stage in stages:
+        for size in sizes:
+            queue = ctx.Queue()
+            proc = ctx.Process(target=_run_stage, args=(stage, size, options, queue))
+            proc.start()
+            try:
+                result = queue.get(timeout=options["timeout"])
+            except Exception:
+                proc.terminate()
+                result = {"stage": stage, "size": size, "status": "error", "reason": "timed out"}
+            proc.join()
+            print(_format_result(result), flush=True)
+            results.append(result)
+    return {
+        "meta": {
+            "timestamp": int(time.time()),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "options": options,
+        },
+        "results": results,
+    }
+
+
+def _format_result(r: Dict[str, Any]) -> str:
+    label = f"{r['stage']:<10} n={r['size']:<6}"
+    if r["status"] != "ok":
+        return f"{label} {r['status']}: {r.get('reason', '')}"
+    lat = r["latency"]
+    p50 = f"{lat['p50'] * 1000:.1f}ms" if lat.get("p50") is not None else "-"
+    p99 = f"{lat['p99'] * 1000:.1f}ms" if lat.get("p99") is not None else "-"
+    return (f"{label} {r['seconds']:>8.2f}s {r['throughput'] or 0:>10.1f}/s "
+            f"p50={p50:<9} p99={p99:<9} rss={r['peak_rss_mb']}MB")
+
+
+def compare(previous: Dict[str, Any], current: Dict[str, Any]) -> None:
+    """Print throughput and p50 change per stage/size relative to an earlier run"""
+    before = {(r["stage"], r["size"]): r for r in previous.get("results", []) if r.get("status") == "ok"}
+    print("\nChange vs previous run:")
+    for r in current["results"]:
+        old = before.get((r["stage"], r["size"]))
+        if r.get("status") != "ok" or not old:
+            continue
+        def pct(new, prev):
+            return f"{(new - prev) / prev * 100:+.1f}%" if new is not None and prev else "n/a"
+        print(f"  {r['stage']:<10} n={r['size']:<6} throughput {pct(r['throughput'], old['throughput']):>8}  "
+              f"p50 {pct(r['latency'].get('p50'), old['latency'].get('p50')):>8}  "
+              f"rss {pct(r['peak_rss_mb'], old['peak_rss_mb']):>8}")
+
+
+def main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(description="Run offline pipeline benchmarks against local fixtures")
+    parser.add_argument("--stages", default=",".join(STAGES), help="Comma-separated stages to run")
+    parser.add_argument("--sizes", default="100,1000,10000", help="Comma-separated synthetic library sizes")
+    parser.add_argument("--latency", type=float, default=0.02, help="Fixture response latency in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.02, help="Fraction of Exophase requests answered with 429")
+    parser.add_argument("--workers", type=int, default=1, help="Transcode workers")
+    parser.add_argument("--clients", type=int, default=8, help="Concurrent clients for the serve stage")
+    parser.add_argument("--store-limit", type=int, default=3,
+                        help="Max games per size for the store stage (each costs ~20s of fixed waits)")
+    parser.add_argument("--timeout", type=float, default=1800, help="Per stage/size timeout in seconds")
+    parser.add_argument("--out", help="Write results JSON to this path")
+    parser.add_argument("--compare", help="Earlier results JSON to compare against")
+    args = parser.parse_args(argv[1:])
+
+    stages = [s.strip() for s in args.stages.split(",") if s.strip()]
+    unknown = [s for s in stages if s not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown stage(s): {', '.join(unknown)}")
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    options = {
+        "latency": args.latency,
+        "error_rate": args.error_rate,
+        "workers": args.workers,
+        "clients": args.clients,
+        "store_limit": args.store_limit,
+        "timeout": args.timeout,
+    }
+
+    report = run(stages, sizes, options)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nWrote results to {args.out}")
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            compare(json.load(f), report)
+    return 0 if all(r["status"] != "error" for r in report["results"]) else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv))
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Build a deployable copy of the viewer in dist/ from docs/.
+
+- Static assets (app.js, logo.svg, games.json) get content-hashed filenames
+  so they can be served with long-lived immutable caching.
+- A compact slice of the games data for the first screen is inlined into
+  index.html, so the grid renders without waiting on a fetch.
+- The square thumbnails of those first-screen games are packed into a single
+  WebP atlas (requires Pillow) with their coordinates in the inlined data.
+- sw.js keeps its name but precaches the fingerprinted shell, and its cache
+  version changes whenever any of the built assets do.
+"""
+
+import sys
+import os
+import json
+import shutil
+import hashlib
+import argparse
+from typing import Any, Dict, List, Optional
+
+try:
+    from PIL import Image
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+
+from naming import clean_name
+
+REPO_ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# Assets referenced from index.html that get fingerprinted filenames
+HASHED_ASSETS = ["app.js", "logo.svg"]
+
+
+def content_hash(data: bytes, length: int = 10) -> str:
+    return hashlib.sha256(data).hexdigest()[:length]
+
+
+def hashed_name(name: str, digest: str) -> str:
+    stem, ext = os.path.splitext(name)
+    return f"{stem}.{digest}{ext}"
+
+
+def first_screen(games: List[Dict[str, Any]], count: int) -> List[Dict[str, Any]]:
+    """Games shown first with the default 'recent' sort, trimmed to the fields the grid needs"""
+    ordered = sorted(games, key=lambda g: int(g.get("last_played") or 0), reverse=True)
+    return [
+        {
+            "title": g.get("title", ""),
+            "playtime": g.get("playtime", ""),
+            "last_played": g.get("last_played", ""),
+        }
+        for g in ordered[:count]
+    ]
+
+
+def build_atlas(rows: List[Dict[str, Any]], images_dir: str, out_path: str,
+                cell: int = 256, columns: int = 6) -> Optional[Dict[str, Any]]:
+    """Pack square thumbnails for rows into one WebP atlas; returns its manifest"""
+    if not PIL_AVAILABLE:
+        print("Skipping atlas (PIL not available)")
+        return None
+
+    sources = []
+    for r in rows:
+        slug = clean_name(r["title"])
+        for candidate in (
+            os.path.join(images_dir, "square-converted", f"{slug}_square.webp"),
+            os.path.join(images_dir, "square", f"{slug}_square.jpg"),
+        ):
+            if os.path.exists(candidate):
+                sources.append((r["title"], candidate))
+                break
+    if not sources:
+        print("Skipping atlas (no thumbnails found)")
+        return None
+
+    columns = min(columns, len(sources))
+    rows_count = (len(sources) + columns - 1) // columns
+    atlas = Image.new("RGB", (columns * cell, rows_count * cell), (12, 17, 27))
+    frames: Dict[str, List[int]] = {}
+    for i, (title, path) in enumerate(sources):
+        col, row = i % columns, i // columns
+        try:
+            with Image.open(path) as img:
+                img.draft("RGB", (cell, cell))
+                tile = img.convert("RGB").resize((cell, cell), Image.Resampling.LANCZOS)
+            atlas.paste(tile, (col * cell, row * cell))
+            tile.close()
+            frames[title] = [col, row]
+        except Exception as e:
+            print(f"Error adding {path} to atlas: {e}")
+    atlas.save(out_path, "WEBP", quality=80, method=6)
+    atlas.close()
+
+    return {"columns": columns, "rows": rows_count, "frames": frames}
+
+
+def write_service_worker(path: str, renamed: Dict[str, str], html: str) -> None:
+    """Point sw.js's precache list at the fingerprinted assets and version its shell cache"""
+    with open(path, "r", encoding="utf-8") as f:
+        sw = f.read()
+    for name, target in renamed.items():
+        sw = sw.replace(f"'{name}'", f"'{target}'")
+    # index.html embeds every other hashed name (and the inlined data), so it versions the lot
+    version = content_hash(html.encode("utf-8"))
+    sw = sw.replace("const VERSION = 'dev';", f"const VERSION = '{version}';")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(sw)
+    print(f"sw.js -> shell version {version}")
+
+
+def build(src_dir: str, out_dir: str, inline_count: int, atlas: bool) -> int:
+    if not os.path.exists(os.path.join(src_dir, "index.html")):
+        print(f"index.html not found in {src_dir}")
+        return 1
+
+    if os.path.exists(out_dir):
+        shutil.rmtree(out_dir)
+    # Copy everything first, then replace the files that get fingerprinted
+    shutil.copytree(src_dir, out_dir, ignore=shutil.ignore_patterns("*-old.*"))
+
+    with open(os.path.join(src_dir, "index.html"), "r", encoding="utf-8") as f:
+        html = f.read()
+
+    renamed: Dict[str, str] = {}
+    for name in HASHED_ASSETS:
+        path = os.path.join(src_dir, name)
+        if not os.path.exists(path):
+            continue
+        with open(path, "rb") as f:
+            data = f.read()
+        target = hashed_name(name, content_hash(data))
+        os.replace(os.path.join(out_dir, name), os.path.join(out_dir, target))
+        html = html.replace(f'src="{name}"', f'src="{target}"')
+        renamed[name] = target
+        print(f"{name} -> {target}")
+
+    games_path = os.path.join(src_dir, "games.json")
+    boot: Dict[str, Any] = {}
+    if os.path.exists(os.path.join(src_dir, "players", "index.json")):
+        # Multi-player sites load the selected player's shard (with its own delta chain)
+        # at runtime; games.json may be stale or absent, so nothing is inlined
+        print("players/index.json found; skipping inlined data and atlas")
+    elif os.path.exists(games_path):
+        with open(games_path, "rb") as f:
+            raw = f.read()
+        games_name = hashed_name("games.json", content_hash(raw))
+        os.replace(os.path.join(out_dir, "games.json"), os.path.join(out_dir, games_name))
+        boot["src"] = games_name
+        print(f"games.json -> {games_name}")
+
+        if inline_count > 0:
+            rows = first_screen(json.loads(raw.decode("utf-8")), inline_count)
+            boot["first"] = rows
+            if atlas:
+                tmp_path = os.path.join(out_dir, "atlas.webp")
+                manifest = build_atlas(rows, os.path.join(src_dir, "images"), tmp_path)
+                if manifest:
+                    with open(tmp_path, "rb") as f:
+                        atlas_name = hashed_name("atlas.webp", content_hash(f.read()))
+                    os.replace(tmp_path, os.path.join(out_dir, atlas_name))
+                    manifest["src"] = atlas_name
+                    boot["atlas"] = manifest
+                    print(f"Packed {len(manifest['frames'])} thumbnails into {atlas_name}")
+
+    if boot:
+        # A JSON data block is never executed, so it is allowed by the script-src CSP.
+        # Escape "</" so titles can't terminate the block early.
+        payload = json.dumps(boot, ensure_ascii=False, separators=(",", ":")).replace("</", "<\\/")
+        block = f'<script type="application/json" id="boot-data">{payload}</script>\n    '
+        html = html.replace("<script src=", block + "<script src=", 1)
+
+    with open(os.path.join(out_dir, "index.html"), "w", encoding="utf-8") as f:
+        f.write(html)
+
+    sw_path = os.path.join(out_dir, "sw.js")
+    if os.path.exists(sw_path):
+        write_service_worker(sw_path, renamed, html)
+
+    print(f"Built site in {out_dir}")
+    return 0
+
+
+def main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(description="Build a fingerprinted copy of docs/ into dist/")
+    parser.add_argument("--src", default=os.path.join(REPO_ROOT, "docs"), help="Source directory")
+    parser.add_argument("--out", default=os.path.join(REPO_ROOT, "dist"), help="Output directory")
+    parser.add_argument("--inline", type=int, default=24,
+                        help="Number of first-screen games to inline into index.html (0 to disable)")
+    parser.add_argument("--no-atlas", action="store_true", help="Don't pack first-screen thumbnails into an atlas")
+    args = parser.parse_args(argv[1:])
+
+    return build(args.src, args.out, args.inline, atlas=not args.no_atlas)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv))
@@ -1,9 +1,20 @@
 const state = {
   games: [],
+  players: [],
+  player: '',
+  stats: null, // precomputed stats.json from scrape_exophase.py, if available
+  images: null, // title -> available image derivatives, from images/manifest.json
   q: '',
   sort: 'recent',
+  sorted: null, // state.games in the current sort order, reused while typing
+  rows: [], // filtered rows the grid windows over
 };
 
+// Search input is applied after typing pauses for this long
+const SEARCH_DEBOUNCE_MS = 120;
+// Extra rows rendered above and below the viewport so fast scrolls don't show gaps
+const OVERSCAN_ROWS = 3;
+
 const $ = sel => document.querySelector(sel);
 const grid = $('#grid');
 const empty = $('#empty');
@@ -51,27 +62,54 @@ function computeStats(rows) {
   return { total, sumMins, last };
 }
 
+function statCard(label, value) {
+  return `<div class="stat"><div class="label">${label}</div><div class="value">${value}</div></div>`;
+}
+
+// stats.json is only rewritten when games change, so whether its final run of
+// played days is still going depends on today's date
+function currentStreak(streak) {
+  if (!streak || !streak.last_day) return 0;
+  const today = Date.parse(new Date().toISOString().slice(0, 10));
+  const days = Math.round((today - Date.parse(streak.last_day)) / 86400000);
+  return days <= 1 ? streak.run : 0;
+}
+
 function renderStats(rows) {
-  const s = computeStats(rows);
-  stats.innerHTML = `
-    <div class="stat"><div class="label">Total games</div><div class="value">${s.total}</div></div>
-    <div class="stat"><div class="label">Total playtime</div><div class="value">${formatPlaytime(s.sumMins)}</div></div>
-    <div class="stat"><div class="label">Last played</div><div class="value">${formatDateFromEpoch(s.last)}</div></div>
-  `;
+  // Unfiltered view: use the precomputed rollups instead of scanning every row
+  const pre = !state.q.trim() && state.stats;
+  const s = pre ? {
+    total: state.stats.totals.games,
+    sumMins: state.stats.totals.minutes,
+    last: state.stats.totals.last_played,
+  } : computeStats(rows);
+  let html = statCard('Total games', s.total)
+    + statCard('Total playtime', formatPlaytime(s.sumMins))
+    + statCard('Last played', formatDateFromEpoch(s.last));
+  if (pre) {
+    const month = new Date().toISOString().slice(0, 7);
+    const monthMins = state.stats.months[month] || 0;
+    const streak = currentStreak(state.stats.streak);
+    html += statCard('This month', formatPlaytime(monthMins))
+      + statCard('Streak', `${streak} day${streak !== 1 ? 's' : ''}`);
+  }
+  stats.innerHTML = html;
 }
 
 function normalize(str){
   return (str||'').normalize('NFD').replace(/\p{Diacritic}/gu,'').toLowerCase();
 }
 
-function applyFilters() {
-  const q = normalize(state.q.trim());
-  let rows = state.games.filter(g => !q || normalize(g.title).includes(q));
-
-  // Update empty message with query
-  const msg = q ? `No results for "${state.q}".` : 'No results.';
-  empty.textContent = msg;
+function setGames(games) {
+  state.games = games;
+  state.sorted = null;
+  applyFilters();
+}
 
+function sortedGames() {
+  // Filtering keeps order, so one sort per data load / sort change covers every keystroke
+  if (state.sorted && state.sorted.sort === state.sort) return state.sorted.rows;
+  const rows = state.games.slice();
   switch (state.sort) {
     case 'alpha':
       rows.sort((a,b)=>cmp(a.title.toLowerCase(), b.title.toLowerCase()));
@@ -85,34 +123,114 @@ function applyFilters() {
     default: // recent
       rows.sort((a,b)=> (b.last_played||0) - (a.last_played||0));
   }
+  state.sorted = { sort: state.sort, rows };
+  return rows;
+}
+
+function applyFilters() {
+  const q = normalize(state.q.trim());
+  const rows = sortedGames().filter(g => !q || g.search.includes(q));
+
+  // Update empty message with query
+  const msg = q ? `No results for "${state.q}".` : 'No results.';
+  empty.textContent = msg;
 
   renderStats(rows);
   renderGrid(rows);
 }
 
-function renderGrid(rows) {
-  if (!rows.length) {
-    grid.innerHTML = '';
-    empty.hidden = false;
-    return;
-  }
-  empty.hidden = true;
-  const frag = document.createDocumentFragment();
-  rows.forEach(r => {
-    const card = document.createElement('article');
+// Windowed grid: only the rows of cards around the viewport exist in the DOM; padding
+// on the grid stands in for the rest so the scrollbar still reflects the whole list.
+const view = {
+  cards: new Map(), // title -> card element, reused across filter/sort changes
+  columns: 1,
+  rowHeight: 0,
+  first: -1,
+  last: -1,
+  pending: false,
+};
+
+function measureGrid() {
+  const style = getComputedStyle(grid);
+  // auto-fill resolves to the actual track sizes, e.g. "180px 180px 180px"
+  const tracks = style.gridTemplateColumns.split(' ').filter(Boolean);
+  const width = parseFloat(tracks[0]) || 180;
+  view.columns = Math.max(1, tracks.length);
+  view.rowHeight = width + (parseFloat(style.rowGap) || 0); // cards are square
+}
+
+function cardSignature(r) {
+  return `${r.playMins}|${r.sprite}|${r.image_square.src}`;
+}
+
+function cardFor(r) {
+  let card = view.cards.get(r.title);
+  if (!card) {
+    card = document.createElement('article');
     card.className = 'card';
+    // Add click event to show modal
+    card.addEventListener('click', () => showGameModal(card.row));
+    view.cards.set(r.title, card);
+  }
+  card.row = r;
+  const sig = cardSignature(r);
+  if (card.sig !== sig) {
+    card.sig = sig;
     card.innerHTML = `
       <div class="image-container">
-        <img class="thumb" src="${r.image_square}" alt="Cover art for ${r.title}" loading="lazy" decoding="async" />
+        ${r.sprite
+          ? `<div class="thumb" role="img" aria-label="Cover art for ${r.title}" style="${r.sprite}"></div>`
+          : r.image_square.src
+            ? `<img class="thumb" src="${r.image_square.src}"${sizeAttrs(r.image_square)} alt="Cover art for ${r.title}" loading="lazy" decoding="async" />`
+            : `<div class="thumb no-art" role="img" aria-label="No cover art for ${r.title}">${r.title}</div>`}
         <span class="playtime-badge" title="Playtime">${formatPlaytime(r.playMins, false)}</span>
       </div>
     `;
-    // Add click event to show modal
-    card.addEventListener('click', () => showGameModal(r));
-    frag.appendChild(card);
+  }
+  return card;
+}
+
+function renderWindow(force = false) {
+  const rows = state.rows;
+  const total = Math.ceil(rows.length / view.columns);
+  const gridTop = grid.getBoundingClientRect().top + window.scrollY;
+  const top = window.scrollY - gridTop;
+  const rowHeight = view.rowHeight || 1;
+  const last = Math.min(total, Math.ceil((top + window.innerHeight) / rowHeight) + OVERSCAN_ROWS);
+  const first = Math.min(last, Math.max(0, Math.floor(top / rowHeight) - OVERSCAN_ROWS));
+  if (!force && first === view.first && last === view.last) return;
+  view.first = first;
+  view.last = last;
+
+  const cards = [];
+  for (let i = first * view.columns; i < Math.min(rows.length, last * view.columns); i++) {
+    cards.push(cardFor(rows[i]));
+  }
+  grid.style.paddingTop = `${first * rowHeight}px`;
+  grid.style.paddingBottom = `${Math.max(0, total - last) * rowHeight}px`;
+  grid.replaceChildren(...cards);
+}
+
+function scheduleWindow() {
+  if (view.pending) return;
+  view.pending = true;
+  requestAnimationFrame(() => {
+    view.pending = false;
+    renderWindow();
   });
-  grid.innerHTML = '';
-  grid.appendChild(frag);
+}
+
+function renderGrid(rows) {
+  state.rows = rows;
+  if (!rows.length) {
+    grid.replaceChildren();
+    grid.style.paddingTop = grid.style.paddingBottom = '';
+    empty.hidden = false;
+    return;
+  }
+  empty.hidden = true;
+  measureGrid();
+  renderWindow(true);
 }
 
 function showGameModal(game) {
@@ -121,26 +239,29 @@ function showGameModal(game) {
   const modal = document.getElementById('game-modal');
   
   // Set initial state with the square image while loading
-  modalImage.src = game.image_square;
-  modalImage.classList.add('loading');
+  const size = game.image_main.src ? game.image_main : game.image_square;
+  setImage(modalImage, game.image_square.src ? game.image_square : game.image_main, size);
+  modalImage.classList.toggle('loading', !!game.image_main.src);
   
   // Update modal content
   document.getElementById('modal-title').textContent = game.title;
   document.getElementById('modal-playtime').textContent = formatPlaytime(game.playMins, true); // Use full format
   document.getElementById('modal-last-played').textContent = formatDateFromEpoch(game.last_played);
   
-  // Create a new image to preload the full resolution image
-  const img = new Image();
-  img.onload = function() {
-    // When loaded, update the modal image and remove loading state
-    modalImage.src = game.image_main;
-    modalImage.classList.remove('loading');
-  };
-  img.onerror = function() {
-    // If there's an error, keep the original image
-    modalImage.classList.remove('loading');
-  };
-  img.src = game.image_main;
+  // Create a new image to preload the full resolution image (only if there is one)
+  if (game.image_main.src) {
+    const img = new Image();
+    img.onload = function() {
+      // When loaded, update the modal image and remove loading state
+      setImage(modalImage, game.image_main);
+      modalImage.classList.remove('loading');
+    };
+    img.onerror = function() {
+      // If there's an error, keep the original image
+      modalImage.classList.remove('loading');
+    };
+    img.src = game.image_main.src;
+  }
   
   // Show modal
   modal.classList.add('active');
@@ -192,47 +313,285 @@ function titleToFilename(title) {
     .replace(/ /g, '_');       // .replace(' ', '_') - replace single spaces with underscores (not \s+)
 }
 
-async function loadJSON() {
-  const res = await fetch('games.json', { cache: 'no-store' });
-  const games = await res.json();
-  const rows = games.map(game => {
-    const title = game.title;
-    const playtime = game.playtime;
-    const last_played = game.last_played ? Number(game.last_played) : 0;
-    
-    // Generate local image paths
-    const filename = titleToFilename(title);
-    const image_square = `images/square-converted/${filename}_square.webp`;
-    const image_main = `images/main/${filename}_main.jpg`;
-    
-    return { 
-      title, 
-      playtime, 
-      last_played, 
-      playMins: parsePlaytime(playtime),
-      image_square,
-      image_main
-    };
+// Build step (build_site.py) may inline a first-screen slice of the data and a thumbnail atlas
+function readBootData() {
+  const el = document.getElementById('boot-data');
+  if (!el) return null;
+  try {
+    return JSON.parse(el.textContent);
+  } catch (e) {
+    return null;
+  }
+}
+
+function spriteStyle(atlas, frame) {
+  const [col, row] = frame;
+  const x = atlas.columns > 1 ? (col / (atlas.columns - 1)) * 100 : 0;
+  const y = atlas.rows > 1 ? (row / (atlas.rows - 1)) * 100 : 0;
+  return `background-image:url('${atlas.src}');background-size:${atlas.columns * 100}% ${atlas.rows * 100}%;background-position:${x}% ${y}%`;
+}
+
+// Preferred derivative first; files listed in images/manifest.json (scraper/batch_scraper.py)
+const SQUARE_DERIVATIVES = ['square-converted', 'square'];
+const MAIN_DERIVATIVES = ['main-converted', 'main'];
+const NO_IMAGE = { src: '' };
+
+function pickImage(entry, derivatives) {
+  const found = derivatives.map(d => entry[d]).find(Boolean);
+  if (!found) return NO_IMAGE;
+  // The content hash keeps cached copies valid until the file actually changes
+  return { src: `images/${found.file}?v=${found.hash}`, width: found.width, height: found.height };
+}
+
+function imagesFor(title, atlas) {
+  if (state.images) {
+    const entry = state.images[title] || {};
+    return { square: pickImage(entry, SQUARE_DERIVATIVES), main: pickImage(entry, MAIN_DERIVATIVES) };
+  }
+  // Inlined first screen before the manifest arrives: the atlas only has games with art
+  if (atlas) return { square: NO_IMAGE, main: NO_IMAGE };
+  // No manifest at all (older deployments): guess paths from the title
+  const filename = titleToFilename(title);
+  return {
+    square: { src: `images/square-converted/${filename}_square.webp` },
+    main: { src: `images/main/${filename}_main.jpg` },
+  };
+}
+
+function sizeAttrs(image) {
+  return image.width && image.height ? ` width="${image.width}" height="${image.height}"` : '';
+}
+
+function setImage(img, image, size = image) {
+  if (image.src) img.src = image.src; else img.removeAttribute('src');
+  // Intrinsic size up front so the modal doesn't jump when the full image replaces the thumbnail
+  if (size.width && size.height) {
+    img.width = size.width;
+    img.height = size.height;
+  } else {
+    img.removeAttribute('width');
+    img.removeAttribute('height');
+  }
+}
+
+function toRow(game, atlas) {
+  const title = game.title;
+  const playtime = game.playtime;
+  const last_played = game.last_played ? Number(game.last_played) : 0;
+  
+  // Local image paths, only for files that exist
+  const images = imagesFor(title, atlas);
+  const frame = atlas && atlas.frames[title];
+  
+  return { 
+    title, 
+    playtime, 
+    last_played, 
+    playMins: parsePlaytime(playtime),
+    search: normalize(title),
+    image_square: images.square,
+    image_main: images.main,
+    sprite: frame ? spriteStyle(atlas, frame) : ''
+  };
+}
+
+function cacheKey(base) {
+  return `games-cache:${base}`;
+}
+
+function readCache(base) {
+  try {
+    return JSON.parse(localStorage.getItem(cacheKey(base)));
+  } catch (e) {
+    return null;
+  }
+}
+
+function writeCache(base, entry) {
+  try {
+    localStorage.setItem(cacheKey(base), JSON.stringify(entry));
+  } catch (e) {
+    // Storage full or disabled; we'll just refetch next time
+  }
+}
+
+async function fetchJSON(url, options) {
+  const res = await fetch(url, options);
+  if (!res.ok) throw new Error(`Failed to load ${url}: ${res.status}`);
+  return res.json();
+}
+
+function applyDelta(games, delta) {
+  const byTitle = new Map(games.map(g => [g.title, g]));
+  delta.removed.forEach(title => byTitle.delete(title));
+  delta.added.concat(delta.changed).forEach(g => byTitle.set(g.title, g));
+  return Array.from(byTitle.values());
+}
+
+// Bring the locally cached copy up to the version in data/manifest.json (written by
+// scrape_exophase.py), applying per-run deltas when possible instead of refetching everything.
+// `base` is '' for the single-player layout or 'players/<id>-<env>/' for a player shard.
+async function loadGamesData(base = '') {
+  let manifest;
+  try {
+    manifest = await fetchJSON(`${base}data/manifest.json`, { cache: 'no-store' });
+  } catch (e) {
+    return fetchJSON(`${base}games.json`, { cache: 'no-store' });
+  }
+
+  const cached = readCache(base);
+  if (cached && cached.hash === manifest.hash) return cached.games;
+
+  if (cached) {
+    // Follow the chain by content hash, not version number: versions restart if the
+    // manifest is ever lost, and a delta from another history must not be applied
+    const chain = [];
+    let hash = cached.hash;
+    for (const d of manifest.deltas) {
+      if (d.from_hash === hash) {
+        chain.push(d);
+        hash = d.to_hash;
+      }
+    }
+    if (chain.length && hash === manifest.hash) {
+      try {
+        const deltas = await Promise.all(chain.map(d => fetchJSON(`${base}data/${d.file}`)));
+        if (deltas.every((delta, i) => delta.from_hash === chain[i].from_hash && delta.to_hash === chain[i].to_hash)) {
+          const games = deltas.reduce(applyDelta, cached.games);
+          writeCache(base, { version: manifest.version, hash: manifest.hash, games });
+          return games;
+        }
+      } catch (e) {
+        // Missing or broken delta; fall back to the full file
+      }
+    }
+  }
+
+  const games = await fetchJSON(`${base}games.json?v=${manifest.hash}`);
+  writeCache(base, { version: manifest.version, hash: manifest.hash, games });
+  return games;
+}
+
+// players/index.json exists when scrape_exophase.py ran with several players
+async function loadPlayers() {
+  try {
+    const index = await fetchJSON('players/index.json', { cache: 'no-store' });
+    return index.players || [];
+  } catch (e) {
+    return [];
+  }
+}
+
+function playerBase() {
+  if (!state.players.length) return '';
+  const player = state.players.find(p => p.key === state.player) || state.players[0];
+  state.player = player.key;
+  return `players/${player.key}/`;
+}
+
+function renderPlayerPicker() {
+  const picker = $('#player');
+  picker.hidden = state.players.length < 2;
+  picker.innerHTML = '';
+  state.players.forEach(p => {
+    const opt = document.createElement('option');
+    opt.value = p.key;
+    opt.textContent = p.name || `${p.id} (${p.environment})`;
+    picker.appendChild(opt);
   });
-  state.games = rows;
-  applyFilters();
+  picker.value = state.player;
+}
+
+async function loadStats(base = '') {
+  try {
+    return await fetchJSON(`${base}stats.json`, { cache: 'no-store' });
+  } catch (e) {
+    return null;
+  }
+}
+
+async function loadImageManifest() {
+  try {
+    const manifest = await fetchJSON('images/manifest.json', { cache: 'no-cache' });
+    return manifest.games || {};
+  } catch (e) {
+    return null;
+  }
+}
+
+async function loadPlayerGames() {
+  const base = playerBase();
+  const [games, stats, images] = await Promise.all([
+    loadGamesData(base),
+    loadStats(base),
+    state.images || loadImageManifest(),
+  ]);
+  state.stats = stats;
+  state.images = images;
+  setGames(games.map(g => toRow(g)));
+}
+
+async function loadJSON(refresh = false) {
+  const boot = readBootData();
+  const atlas = boot && boot.atlas;
+  if (boot && boot.first && !refresh) {
+    // Paint the first screen immediately from the inlined slice
+    setGames(boot.first.map(g => toRow(g, atlas)));
+  }
+  // Fingerprinted data from the build step can come straight from the HTTP cache.
+  // build_site.py only inlines this for single-player sites; shards go through loadPlayers().
+  if (boot && boot.src) {
+    const [games, stats, images] = await Promise.all([
+      fetchJSON(boot.src, { cache: 'force-cache' }),
+      loadStats(),
+      loadImageManifest(),
+    ]);
+    state.stats = stats;
+    state.images = images;
+    setGames(games.map(g => toRow(g, atlas)));
+    return;
+  }
+  state.players = await loadPlayers();
+  playerBase();
+  renderPlayerPicker();
+  await loadPlayerGames();
 }
 
 function bindUI() {
   const q = $('#q');
   const sort = $('#sort');
 
-  q.addEventListener('input', () => { state.q = q.value; applyFilters(); updateURL(); });
+  let searchTimer;
+  q.addEventListener('input', () => {
+    clearTimeout(searchTimer);
+    searchTimer = setTimeout(() => { state.q = q.value; applyFilters(); updateURL(); }, SEARCH_DEBOUNCE_MS);
+  });
   q.addEventListener('keydown', (e) => { if (e.key === 'Enter') { e.preventDefault(); q.blur(); } });
   window.addEventListener('keydown', (e)=>{ if(e.key==='/' && document.activeElement!==q){ e.preventDefault(); q.focus(); }});
 
   sort.addEventListener('change', ()=>{ state.sort = sort.value; applyFilters(); updateURL(); });
+
+  const player = $('#player');
+  player.addEventListener('change', ()=>{
+    state.player = player.value;
+    updateURL();
+    view.cards.clear(); // different player, different cards
+    loadPlayerGames();
+  });
+
+  window.addEventListener('scroll', scheduleWindow, { passive: true });
+  window.addEventListener('resize', () => {
+    if (!state.rows.length) return;
+    measureGrid();
+    renderWindow(true);
+  });
 }
 
 function updateURL(){
   const params = new URLSearchParams();
   if (state.q) params.set('q', state.q);
   if (state.sort && state.sort !== 'recent') params.set('sort', state.sort);
+  if (state.player && state.players.length > 1) params.set('player', state.player);
   const url = `${location.pathname}?${params.toString()}`;
   history.replaceState(null, '', url);
 }
@@ -241,12 +600,30 @@ function initFromURL(){
   const params = new URLSearchParams(location.search);
   const q = params.get('q') || '';
   const sort = params.get('sort') || 'recent';
-  state.q = q; state.sort = sort;
+  state.q = q; state.sort = sort; state.player = params.get('player') || '';
   $('#q').value = q; $('#sort').value = sort;
 }
 
+// sw.js serves repeat visits from cache and tells us when data files changed underneath
+let refreshTimer;
+function registerServiceWorker() {
+  if (!('serviceWorker' in navigator)) return;
+  navigator.serviceWorker.addEventListener('message', (e) => {
+    if (!e.data || e.data.type !== 'data-updated') return;
+    // Several files usually change together; reload once
+    clearTimeout(refreshTimer);
+    refreshTimer = setTimeout(() => { state.images = null; loadJSON(true); }, 250);
+  });
+  window.addEventListener('load', () => {
+    navigator.serviceWorker.register('sw.js').catch(() => {
+      // Unsupported context (e.g. file://); the page works without it
+    });
+  });
+}
+
 initFromURL();
 bindUI();
+registerServiceWorker();
 loadJSON();
 
 // Close modal when clicking overlay or close button
@@ -0,0 +1,176 @@
+// Service worker for the viewer: the app shell is precached, data files are served
+// stale-while-revalidate (the page is told when they change), and cover art is kept
+// in a cache bounded by total size, evicting the least recently used images.
+
+const VERSION = 'dev'; // build_site.py replaces this with a hash of the built assets
+const SHELL_CACHE = `shell-${VERSION}`;
+const DATA_CACHE = 'data-v1';
+const COVER_CACHE = 'covers-v1';
+const CACHES = [SHELL_CACHE, DATA_CACHE, COVER_CACHE];
+
+// build_site.py rewrites these to the fingerprinted names
+const SHELL = ['./', 'index.html', 'app.js', 'logo.svg'];
+
+const COVER_CACHE_BYTES = 40 * 1024 * 1024;
+// Cover bookkeeping (url -> [bytes, last used]) lives in the cover cache under this key
+const LRU_KEY = '__lru__';
+// Last-used times are written back at most this often on cache hits
+const LRU_SAVE_MS = 5000;
+
+// Updated in place by scrape_exophase.py / batch_scraper.py
+const REVALIDATE = [
+  /\/data\/manifest\.json$/,
+  /\/games\.json$/,
+  /\/stats\.json$/,
+  /\/players\/index\.json$/,
+  /\/images\/manifest\.json$/,
+];
+// Content-addressed: a URL never changes meaning, so the cached copy is always good
+const IMMUTABLE = [/\/data\/deltas\//, /\.[0-9a-f]{10}\.(js|json|svg|webp)$/];
+
+self.addEventListener('install', event => {
+  event.waitUntil(caches.open(SHELL_CACHE).then(cache => cache.addAll(SHELL)).then(() => self.skipWaiting()));
+});
+
+self.addEventListener('activate', event => {
+  event.waitUntil((async () => {
+    const names = await caches.keys();
+    await Promise.all(names.filter(n => !CACHES.includes(n)).map(n => caches.delete(n)));
+    await self.clients.claim();
+  })());
+});
+
+self.addEventListener('fetch', event => {
+  const request = event.request;
+  if (request.method !== 'GET' || request.headers.has('range')) return;
+  const url = new URL(request.url);
+  if (url.origin !== location.origin) return; // fonts are left to the browser
+
+  const path = url.pathname;
+  if (request.mode === 'navigate') {
+    // Any ?q=/sort= view of the page is the same shell
+    event.respondWith(staleWhileRevalidate(event, SHELL_CACHE, request, new URL('./', self.registration.scope).href));
+  } else if (IMMUTABLE.some(re => re.test(path))) {
+    event.respondWith(cacheFirst(event, path.includes('/data/') ? DATA_CACHE : SHELL_CACHE, request));
+  } else if (REVALIDATE.some(re => re.test(path))) {
+    // games.json?v=<hash> is fetched only after the manifest says that version is current
+    if (url.searchParams.has('v')) event.respondWith(cacheFirst(event, DATA_CACHE, request, true));
+    else event.respondWith(staleWhileRevalidate(event, DATA_CACHE, request, request.url, true));
+  } else if (path.includes('/images/')) {
+    event.respondWith(coverFirst(event, request));
+  } else if (SHELL.some(name => new URL(name, self.registration.scope).pathname === path)) {
+    event.respondWith(staleWhileRevalidate(event, SHELL_CACHE, request, request.url));
+  }
+});
+
+async function notifyClients(url) {
+  const clients = await self.clients.matchAll({ type: 'window' });
+  clients.forEach(client => client.postMessage({ type: 'data-updated', url }));
+}
+
+async function staleWhileRevalidate(event, cacheName, request, key, notify = false) {
+  const cache = await caches.open(cacheName);
+  const cached = await cache.match(key);
+  // Clone now: the page may consume the cached body before the network answers
+  const previous = cached && notify ? cached.clone() : null;
+  const network = fetch(request).then(async response => {
+    if (!response.ok) return response;
+    const changed = previous
+      && (await previous.text()) !== (await response.clone().text());
+    await cache.put(key, response.clone());
+    if (changed) await notifyClients(request.url);
+    return response;
+  });
+  if (!cached) return network;
+  event.waitUntil(network.catch(() => {}));
+  return cached;
+}
+
+async function cacheFirst(event, cacheName, request, replacesOlder = false) {
+  const cache = await caches.open(cacheName);
+  const cached = await cache.match(request);
+  if (cached) return cached;
+  const response = await fetch(request);
+  if (response.ok) {
+    const copy = response.clone();
+    event.waitUntil((async () => {
+      await cache.put(request, copy);
+      if (!replacesOlder) return;
+      // Drop superseded versions of the same file (games.json?v=<old hash>)
+      const path = new URL(request.url).pathname;
+      const keys = await cache.keys();
+      await Promise.all(keys
+        .filter(k => k.url !== request.url && new URL(k.url).pathname === path && new URL(k.url).searchParams.has('v'))
+        .map(k => cache.delete(k)));
+    })());
+  }
+  return response;
+}
+
+let lruReady = null;
+let lruSaved = 0;
+
+function loadLru(cache) {
+  lruReady = lruReady || (async () => {
+    const saved = await cache.match(LRU_KEY);
+    const lru = new Map(saved ? await saved.json() : []);
+    // Reconcile with the cache: bookkeeping may lag if the worker was stopped mid-write
+    const urls = new Set();
+    for (const key of await cache.keys()) {
+      if (key.url.endsWith(`/${LRU_KEY}`)) continue;
+      urls.add(key.url);
+      if (!lru.has(key.url)) {
+        const response = await cache.match(key);
+        lru.set(key.url, [Number(response.headers.get('Content-Length')) || (await response.blob()).size, 0]);
+      }
+    }
+    for (const url of lru.keys()) if (!urls.has(url)) lru.delete(url);
+    return lru;
+  })();
+  return lruReady;
+}
+
+function saveLru(cache, lru, force = false) {
+  if (!force && Date.now() - lruSaved < LRU_SAVE_MS) return Promise.resolve();
+  lruSaved = Date.now();
+  return cache.put(LRU_KEY, new Response(JSON.stringify([...lru]), { headers: { 'Content-Type': 'application/json' } }));
+}
+
+async function evict(cache, lru) {
+  let total = 0;
+  lru.forEach(([bytes]) => { total += bytes; });
+  if (total <= COVER_CACHE_BYTES) return;
+  // Oldest first, down to 90% of the cap so every new image doesn't trigger another pass
+  const oldest = [...lru.entries()].sort((a, b) => a[1][1] - b[1][1]);
+  for (const [url, [bytes]] of oldest) {
+    if (total <= COVER_CACHE_BYTES * 0.9) break;
+    await cache.delete(url);
+    lru.delete(url);
+    total -= bytes;
+  }
+}
+
+async function coverFirst(event, request) {
+  const cache = await caches.open(COVER_CACHE);
+  const lru = await loadLru(cache);
+  const cached = await cache.match(request);
+  if (cached) {
+    const entry = lru.get(request.url);
+    if (entry) entry[1] = Date.now();
+    event.waitUntil(saveLru(cache, lru));
+    return cached;
+  }
+  const response = await fetch(request);
+  if (response.ok) {
+    const copy = response.clone();
+    const sized = response.clone();
+    event.waitUntil((async () => {
+      const bytes = (await sized.blob()).size;
+      await cache.put(request, copy);
+      lru.set(request.url, [bytes, Date.now()]);
+      await evict(cache, lru);
+      await saveLru(cache, lru, true);
+    })());
+  }
+  return response;
+}
@@ -0,0 +1,165 @@
+"""
+Lightweight timers, counters and histograms shared by the scrapers and server.
+
+Usage:
+    import metrics
+
+    with metrics.timer("exophase.page_fetch"):
+        ...
+    metrics.incr("exophase.pages")
+    metrics.write_summary()  # JSON to $METRICS_OUT (if set) and a table on stdout
+
+Timer names are dotted "<stage>.<phase>" strings; summaries report count,
+total, mean and p50/p90/p99/max seconds per timer so a slow run shows which
+phase regressed.
+"""
+
+import os
+import json
+import time
+import random
+import threading
+import functools
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional
+
+# Samples kept per histogram; beyond this, reservoir sampling keeps percentiles representative
+MAX_SAMPLES = 10000
+
+
+class Metrics:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._started = time.time()
+        self._counters: Dict[str, float] = {}
+        self._samples: Dict[str, List[float]] = {}
+        self._counts: Dict[str, int] = {}
+        self._sums: Dict[str, float] = {}
+        self._max: Dict[str, float] = {}
+
+    def incr(self, name: str, value: float = 1) -> None:
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def observe(self, name: str, value: float) -> None:
+        with self._lock:
+            count = self._counts.get(name, 0) + 1
+            self._counts[name] = count
+            self._sums[name] = self._sums.get(name, 0.0) + value
+            self._max[name] = max(self._max.get(name, value), value)
+            samples = self._samples.setdefault(name, [])
+            if len(samples) < MAX_SAMPLES:
+                samples.append(value)
+            else:
+                slot = random.randrange(count)
+                if slot < MAX_SAMPLES:
+                    samples[slot] = value
+
+    @contextmanager
+    def timer(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start)
+
+    def timed(self, name: str) -> Callable:
+        """Decorator form of timer()"""
+        def decorator(func: Callable) -> Callable:
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.timer(name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            timers = {}
+            for name, samples in self._samples.items():
+                ordered = sorted(samples)
+                count = self._counts[name]
+                timers[name] = {
+                    "count": count,
+                    "total": round(self._sums[name], 6),
+                    "mean": round(self._sums[name] / count, 6),
+                    "p50": round(_percentile(ordered, 0.50), 6),
+                    "p90": round(_percentile(ordered, 0.90), 6),
+                    "p99": round(_percentile(ordered, 0.99), 6),
+                    "max": round(self._max[name], 6),
+                }
+            return {
+                "started": int(self._started),
+                "elapsed": round(time.time() - self._started, 3),
+                "counters": dict(self._counters),
+                "timers": timers,
+            }
+
+    def prometheus_text(self) -> str:
+        """Render counters and timer summaries in the Prometheus text exposition format"""
+        data = self.summary()
+        lines = []
+        for name, value in sorted(data["counters"].items()):
+            metric = _prom_name(name) + "_total"
+            lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{metric} {value}")
+        for name, t in sorted(data["timers"].items()):
+            metric = _prom_name(name) + "_seconds"
+            lines.append(f"# TYPE {metric} summary")
+            for quantile, key in (("0.5", "p50"), ("0.9", "p90"), ("0.99", "p99")):
+                lines.append(f'{metric}{{quantile="{quantile}"}} {t[key]}')
+            lines.append(f"{metric}_sum {t['total']}")
+            lines.append(f"{metric}_count {t['count']}")
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        with self._lock:
+            self._started = time.time()
+            for table in (self._counters, self._samples, self._counts, self._sums, self._max):
+                table.clear()
+
+
+def _percentile(ordered: List[float], q: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def _prom_name(name: str) -> str:
+    return "".join(c if c.isalnum() else "_" for c in name)
+
+
+# Process-wide registry used by the module-level helpers
+REGISTRY = Metrics()
+
+incr = REGISTRY.incr
+observe = REGISTRY.observe
+timer = REGISTRY.timer
+timed = REGISTRY.timed
+summary = REGISTRY.summary
+prometheus_text = REGISTRY.prometheus_text
+
+
+def print_summary() -> None:
+    data = summary()
+    if not data["timers"] and not data["counters"]:
+        return
+    print(f"\nMetrics ({data['elapsed']:.1f}s elapsed):")
+    for name, t in sorted(data["timers"].items()):
+        print(f"  {name:<28} n={t['count']:<5} total={t['total']:.3f}s "
+              f"p50={t['p50']:.3f}s p90={t['p90']:.3f}s max={t['max']:.3f}s")
+    for name, value in sorted(data["counters"].items()):
+        print(f"  {name:<28} {value:g}")
+
+
+def write_summary(path: Optional[str] = None) -> None:
+    """Print the summary and write it as JSON to path (default: $METRICS_OUT, if set)"""
+    print_summary()
+    path = path or os.environ.get("METRICS_OUT")
+    if not path:
+        return
+    try:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(summary(), f, indent=2)
+    except OSError as e:
+        print(f"Warning: Could not write metrics to {path}: {e}")
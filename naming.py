@@ -0,0 +1,10 @@
+"""
+File naming shared by the image scraper, batch tools and site build.
+"""
+
+import re
+
+
+def clean_name(title: str) -> str:
+    """File stem for a game's images, e.g. "Hades II" -> "hades_ii" """
+    return re.sub(r'[^\w\s-]', '', title).strip().lower().replace(' ', '_')
@@ -0,0 +1,193 @@
+"""
+Incrementally maintained play statistics for the viewer.
+
+Exophase only reports cumulative playtime and a last-played timestamp per
+game, so per-period figures are built up from what changes between scrapes:
+when a game's playtime grows, the gained minutes are credited to the month,
+ISO week and day of its new last-played time. The first build is a baseline
+(totals, rankings and played days only); period minutes accumulate from
+then on ("tracking_since").
+
+State lives in data/rollups.json next to games.json and every update only
+touches the games in the scrape's delta. The viewer reads the small
+stats.json rendered from it instead of recomputing over every row.
+"""
+
+import re
+import time
+import heapq
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+TOP_N = 10
+# Months that get their own top-N list in stats.json
+TOP_MONTHS = 12
+# Retention: weekly totals, per-game month detail, and played days (for streaks)
+KEEP_WEEKS = 104
+KEEP_MONTH_DETAIL = 24
+KEEP_DAYS = 400
+
+
+def parse_playtime(pt: str) -> int:
+    """Minutes from an Exophase playtime string such as "11h 4m" """
+    h = re.search(r"(\d+)h", pt or "")
+    m = re.search(r"(\d+)m", pt or "")
+    return (int(h.group(1)) * 60 if h else 0) + (int(m.group(1)) if m else 0)
+
+
+def _when(ts: int) -> datetime:
+    return datetime.fromtimestamp(ts, tz=timezone.utc)
+
+
+def month_key(ts: int) -> str:
+    return _when(ts).strftime("%Y-%m")
+
+
+def week_key(ts: int) -> str:
+    year, week, _ = _when(ts).isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+def day_key(ts: int) -> str:
+    return _when(ts).strftime("%Y-%m-%d")
+
+
+def new_state(now: Optional[int] = None) -> Dict[str, Any]:
+    return {
+        "tracking_since": int(now or time.time()),
+        "games": {},
+        "totals": {"games": 0, "minutes": 0, "last_played": 0},
+        "months": {},
+        "weeks": {},
+        "days": [],
+        "longest_streak": 0,
+        "top": [],
+    }
+
+
+def _credit(state: Dict[str, Any], title: str, minutes: int, ts: int) -> None:
+    month = state["months"].setdefault(month_key(ts), {"minutes": 0, "games": {}})
+    month["minutes"] += minutes
+    month["games"][title] = month["games"].get(title, 0) + minutes
+    week = week_key(ts)
+    state["weeks"][week] = state["weeks"].get(week, 0) + minutes
+
+
+def _update_top(state: Dict[str, Any], touched: List[str]) -> None:
+    """Refresh the all-time top-N only if a touched game could affect it"""
+    top = state["top"]
+    in_top = {title for title, _ in top}
+    floor = top[-1][1] if len(top) >= TOP_N else -1
+    games = state["games"]
+    if not any(t in in_top or (t in games and games[t]["minutes"] >= floor) for t in touched):
+        return
+    best = heapq.nlargest(TOP_N, games.items(), key=lambda item: (item[1]["minutes"], item[0]))
+    state["top"] = [[title, g["minutes"]] for title, g in best]
+
+
+def update(state: Dict[str, Any], changes: Dict[str, list]) -> Dict[str, Any]:
+    """Apply one scrape's added/changed/removed games (see scrape_exophase.diff_rows)"""
+    baseline = not state["games"]
+    games = state["games"]
+    totals = state["totals"]
+    days = set(state["days"])
+    touched = []
+
+    for row in changes["added"] + changes["changed"]:
+        title = row.get("title", "")
+        minutes = parse_playtime(row.get("playtime", ""))
+        last_played = int(row.get("last_played") or 0)
+        old = games.get(title)
+        old_minutes = old["minutes"] if old else 0
+        gained = minutes - old_minutes
+
+        if old is None:
+            totals["games"] += 1
+        totals["minutes"] += gained
+        totals["last_played"] = max(totals["last_played"], last_played)
+        if gained > 0 and last_played and not baseline:
+            _credit(state, title, gained, last_played)
+        if last_played and (old is None or old["last_played"] != last_played):
+            days.add(day_key(last_played))
+
+        games[title] = {"minutes": minutes, "last_played": last_played}
+        touched.append(title)
+
+    recompute_last = False
+    for title in changes["removed"]:
+        old = games.pop(title, None)
+        if not old:
+            continue
+        totals["games"] -= 1
+        totals["minutes"] -= old["minutes"]
+        recompute_last = recompute_last or old["last_played"] == totals["last_played"]
+        touched.append(title)
+    if recompute_last:
+        totals["last_played"] = max((g["last_played"] for g in games.values()), default=0)
+
+    _update_top(state, touched)
+    state["days"] = sorted(days)
+    _prune(state)
+    state["longest_streak"] = max(state["longest_streak"], _longest_streak(state["days"]))
+    return state
+
+
+def _prune(state: Dict[str, Any]) -> None:
+    for key in sorted(state["weeks"])[:-KEEP_WEEKS]:
+        del state["weeks"][key]
+    for key in sorted(state["months"])[:-KEEP_MONTH_DETAIL]:
+        state["months"][key]["games"] = {}
+    state["days"] = state["days"][-KEEP_DAYS:]
+
+
+def _longest_streak(days: List[str]) -> int:
+    longest = run = 0
+    previous = None
+    for day in days:
+        current = datetime.strptime(day, "%Y-%m-%d").date()
+        run = run + 1 if previous and current - previous == timedelta(days=1) else 1
+        longest = max(longest, run)
+        previous = current
+    return longest
+
+
+def _final_run(days: List[str]) -> int:
+    """Consecutive played days ending at the last played day"""
+    played = set(days)
+    if not days:
+        return 0
+    day = datetime.strptime(days[-1], "%Y-%m-%d").date()
+    run = 0
+    while day.isoformat() in played:
+        run += 1
+        day -= timedelta(days=1)
+    return run
+
+
+def render(state: Dict[str, Any]) -> Dict[str, Any]:
+    """The compact stats.json payload for the viewer.
+
+    Depends only on the state, so an unchanged library renders identical bytes;
+    the viewer works out whether the final run is still current from last_day.
+    """
+    months = state["months"]
+    recent_months = sorted(months)[-TOP_MONTHS:]
+    return {
+        "tracking_since": state["tracking_since"],
+        "totals": dict(state["totals"]),
+        "months": {key: months[key]["minutes"] for key in sorted(months)},
+        "weeks": dict(sorted(state["weeks"].items())),
+        "top": {
+            "all_time": [{"title": t, "minutes": m} for t, m in state["top"]],
+            "months": {
+                key: [{"title": t, "minutes": m}
+                      for t, m in heapq.nlargest(TOP_N, months[key]["games"].items(), key=lambda i: (i[1], i[0]))]
+                for key in recent_months
+            },
+        },
+        "streak": {
+            "run": _final_run(state["days"]),
+            "longest": state["longest_streak"],
+            "last_day": state["days"][-1] if state["days"] else None,
+        },
+    }
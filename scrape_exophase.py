@@ -1,6 +1,14 @@
 import sys
+import os
 import json
-from typing import Iterable, Dict, Any
+import hashlib
+import argparse
+import signal
+import stat
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Dict, Any, List, Optional, Tuple
 import time
 
 try:
@@ -9,31 +17,151 @@ try:
 except Exception:  # pragma: no cover
     pass
 
-import urllib.request
-import urllib.error
+import http.client
+import urllib.parse
 
-BASE_URL = (
-    "https://api.exophase.com/public/player/4972201/games?environment=nintendo&sort=5&showHidden=0"
-)
+import metrics
+import rollups
+
+API_URL = "https://api.exophase.com/public/player/{player}/games?environment={environment}&sort=5&showHidden=0"
+DEFAULT_PLAYER = "4972201"
+DEFAULT_ENVIRONMENT = "nintendo"
+
+BASE_URL = API_URL.format(player=DEFAULT_PLAYER, environment=DEFAULT_ENVIRONMENT)
+
+HEADERS = {
+    # Identify politely; many endpoints require a UA header
+    "User-Agent": "switch-game-tracking-scraper/1.0 (+https://exophase.com)"
+}
+
+# Seconds to wait between pages of one player, to avoid hitting the server too hard
+PAGE_DELAY = 3
+# Minimum seconds between any two requests, across all players being scraped
+REQUEST_INTERVAL = 0.5
+# Players scraped at the same time in multi-player mode
+MAX_CONCURRENCY = 4
+# Retries for rate-limited (429) or temporarily unavailable (503) responses
+MAX_RETRIES = 3
+
+# Daemon mode: seconds between first-page polls, doubling while nothing changes
+POLL_MIN_INTERVAL = 60
+POLL_MAX_INTERVAL = 3600
+# Daemon mode: seconds between full re-scrapes, to catch changes beyond the first page
+FULL_REFRESH_INTERVAL = 24 * 3600
+# Sort used for polling; the first page must list the most recently played games
+POLL_SORT = "1"
+
+
+class ConnectionPool:
+    """Keep-alive HTTP(S) connections shared by all scraper threads"""
+
+    def __init__(self, timeout: float = 30) -> None:
+        self.timeout = timeout
+        self._idle: Dict[Tuple[str, str], List[http.client.HTTPConnection]] = {}
+        self._lock = threading.Lock()
+
+    def _acquire(self, scheme: str, netloc: str) -> Tuple[http.client.HTTPConnection, bool]:
+        with self._lock:
+            idle = self._idle.get((scheme, netloc))
+            if idle:
+                return idle.pop(), True
+        cls = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+        return cls(netloc, timeout=self.timeout), False
+
+    def _release(self, key: Tuple[str, str], conn: http.client.HTTPConnection) -> None:
+        with self._lock:
+            self._idle.setdefault(key, []).append(conn)
+
+    def get(self, url: str, headers: Dict[str, str]) -> http.client.HTTPResponse:
+        """GET url; returns the response with its body already read into .data"""
+        parts = urllib.parse.urlsplit(url)
+        key = (parts.scheme, parts.netloc)
+        path = parts.path + (f"?{parts.query}" if parts.query else "")
+        while True:
+            conn, reused = self._acquire(*key)
+            try:
+                conn.request("GET", path, headers=headers)
+                resp = conn.getresponse()
+                resp.data = resp.read()
+            except (http.client.HTTPException, OSError):
+                conn.close()
+                if reused:
+                    # The server closed an idle keep-alive connection; retry on a fresh one
+                    continue
+                raise
+            if resp.will_close:
+                conn.close()
+            else:
+                self._release(key, conn)
+            return resp
+
+    def close(self) -> None:
+        with self._lock:
+            for conns in self._idle.values():
+                for conn in conns:
+                    conn.close()
+            self._idle.clear()
+
+
+class RateLimiter:
+    """Spaces requests at least `interval` seconds apart across all threads"""
+
+    def __init__(self, interval: float) -> None:
+        self.interval = interval
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next)
+            self._next = slot + self.interval
+        delay = slot - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+
+POOL = ConnectionPool()
+RATE_LIMIT = RateLimiter(REQUEST_INTERVAL)
+
+
+def retry_delay(headers: Any, attempt: int) -> float:
+    retry_after = headers.get("Retry-After") if headers else None
+    try:
+        return max(0.0, float(retry_after))
+    except (TypeError, ValueError):
+        return float(PAGE_DELAY * 2 ** attempt)
 
 
 def fetch_json(url: str) -> Dict[str, Any]:
-    req = urllib.request.Request(
-        url,
-        headers={
-            # Identify politely; many endpoints require a UA header
-            "User-Agent": "switch-game-tracking-scraper/1.0 (+https://exophase.com)"
-        },
-    )
+    attempt = 0
+    redirects = 0
+    while True:
+        RATE_LIMIT.wait()
+        try:
+            with metrics.timer("exophase.page_fetch"):
+                resp = POOL.get(url, HEADERS)
+        except (http.client.HTTPException, OSError) as e:
+            raise SystemExit(f"Network error: {e}")
+        if resp.status in (301, 302, 303, 307, 308) and resp.headers.get("Location") and redirects < 5:
+            url = urllib.parse.urljoin(url, resp.headers["Location"])
+            redirects += 1
+            continue
+        if resp.status < 400:
+            break
+        metrics.incr(f"exophase.http_{resp.status}")
+        if resp.status not in (429, 503) or attempt >= MAX_RETRIES:
+            raise SystemExit(f"HTTP error {resp.status}: {resp.reason}")
+        delay = retry_delay(resp.headers, attempt)
+        print(f"HTTP {resp.status}, retrying in {delay:g}s...")
+        time.sleep(delay)
+        attempt += 1
+    raw = resp.data
+    charset = resp.headers.get_content_charset() or "utf-8"
+    metrics.incr("exophase.bytes", len(raw))
     try:
-        with urllib.request.urlopen(req, timeout=30) as resp:
-            charset = resp.headers.get_content_charset() or "utf-8"
-            data = resp.read().decode(charset, errors="replace")
-            return json.loads(data)
-    except urllib.error.HTTPError as e:
-        raise SystemExit(f"HTTP error {e.code}: {e.reason}")
-    except urllib.error.URLError as e:
-        raise SystemExit(f"Network error: {e.reason}")
+        with metrics.timer("exophase.json_decode"):
+            return json.loads(raw.decode(charset, errors="replace"))
     except json.JSONDecodeError as e:
         raise SystemExit(f"Invalid JSON: {e}")
 
@@ -66,43 +194,411 @@ def extract_row(game: Dict[str, Any]) -> Dict[str, str]:
     }
 
 
+# Read once at import: os.umask() can only be queried by setting it, which races with
+# the scraper threads creating directories
+UMASK = os.umask(0o022)
+os.umask(UMASK)
+
+
+def _file_mode(path: str) -> int:
+    """Mode for a rewritten file: the existing one (else 0666) minus the umask, but always
+    with the read bits of 0644 so files left 0600 by older atomic writes are repaired"""
+    try:
+        mode = stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        mode = 0o666 & ~UMASK
+    return mode | (0o644 & ~UMASK)
+
+
+def atomic_write_json(obj: Any, out_path: str, **dump_args: Any) -> None:
+    """Write JSON via a temp file and rename, so readers never see a partial file"""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(out_path) or ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(obj, f, **dump_args)
+        # mkstemp creates 0600 files; the published files must stay readable by the web server
+        os.chmod(tmp_path, _file_mode(out_path))
+        os.replace(tmp_path, out_path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
 def write_json(rows: Iterable[Dict[str, str]], out_path: str) -> None:
-    with open(out_path, "w", encoding="utf-8") as f:
-        json.dump(list(rows), f, indent=2, ensure_ascii=False)
+    atomic_write_json(list(rows), out_path, indent=2, ensure_ascii=False)
 
 
-def build_url(page: int) -> str:
-    return f"{BASE_URL}&page={page}"
+# Number of per-run deltas kept next to the manifest; older clients refetch the full file
+DELTA_HISTORY = 30
 
 
-def main(argv: list[str]) -> int:
-    import os
-    repo_root = os.path.dirname(os.path.abspath(__file__))
-    # default to docs/games.json so GitHub Pages (docs/) serves fresh data
-    out_path = os.path.join(repo_root, "docs", "games.json")
-    if len(argv) > 1:
-        user_path = argv[1]
-        out_path = user_path if os.path.isabs(user_path) else os.path.join(repo_root, user_path)
+def read_json(path: str, default: Any) -> Any:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return default
+
+
+def rows_hash(rows: List[Dict[str, str]]) -> str:
+    data = json.dumps(rows, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    return hashlib.sha256(data).hexdigest()[:16]
+
+
+def diff_rows(old: List[Dict[str, str]], new: List[Dict[str, str]]) -> Dict[str, list]:
+    # Games are keyed by title, which is what the viewer keys them by too
+    old_by_title = {r.get("title", ""): r for r in old}
+    new_by_title = {r.get("title", ""): r for r in new}
+    return {
+        "added": [r for t, r in new_by_title.items() if t not in old_by_title],
+        "changed": [r for t, r in new_by_title.items() if t in old_by_title and old_by_title[t] != r],
+        "removed": [t for t in old_by_title if t not in new_by_title],
+    }
+
+
+def write_delta(old_rows: List[Dict[str, str]], new_rows: List[Dict[str, str]], data_dir: str,
+                changes: Optional[Dict[str, list]] = None) -> Dict[str, Any]:
+    """Bump the data manifest and write a delta from the previous version.
+
+    The manifest lists the current version, its content hash and the last
+    DELTA_HISTORY deltas, so a client holding any of those versions can catch
+    up by applying deltas instead of downloading the whole games.json.
+    """
+    deltas_dir = os.path.join(data_dir, "deltas")
+    os.makedirs(deltas_dir, exist_ok=True)
+    manifest_path = os.path.join(data_dir, "manifest.json")
+    manifest = read_json(manifest_path, {"version": 0, "hash": "", "deltas": []})
+
+    new_hash = rows_hash(new_rows)
+    if manifest.get("hash") == new_hash:
+        return manifest
+
+    version = int(manifest.get("version", 0)) + 1
+    deltas = list(manifest.get("deltas", []))
+    if manifest.get("version") and manifest.get("hash") == rows_hash(old_rows):
+        # Hashes in the link and the file name: versions restart at 1 if the manifest is
+        # lost, and a client must never apply a delta from a different history
+        link = {"from": version - 1, "to": version, "from_hash": manifest["hash"], "to_hash": new_hash}
+        delta = {**link, **(changes or diff_rows(old_rows, new_rows))}
+        name = f"{version}-{new_hash}.json"
+        atomic_write_json(delta, os.path.join(deltas_dir, name), ensure_ascii=False, separators=(",", ":"))
+        deltas.append({**link, "file": f"deltas/{name}"})
+    else:
+        # games.json was changed outside the scraper; the old chain no longer applies
+        deltas = []
+
+    deltas = deltas[-DELTA_HISTORY:]
+    # Drop delta files that are no longer listed (pruned or after a chain reset)
+    listed = {os.path.basename(d["file"]) for d in deltas}
+    for name in os.listdir(deltas_dir):
+        if name.endswith(".json") and name not in listed:
+            os.remove(os.path.join(deltas_dir, name))
+
+    manifest = {
+        "version": version,
+        "hash": new_hash,
+        "generated": int(time.time()),
+        "deltas": deltas,
+    }
+    atomic_write_json(manifest, manifest_path, indent=2)
+    return manifest
+
+
+def build_url(page: int, base_url: Optional[str] = None) -> str:
+    return f"{base_url or BASE_URL}&page={page}"
 
-    # ensure destination directory exists (especially in CI)
-    os.makedirs(os.path.dirname(out_path), exist_ok=True)
 
-    all_rows: list[Dict[str, str]] = []
+def scrape_games(base_url: Optional[str] = None, label: str = "") -> Tuple[List[Dict[str, str]], int]:
+    """Fetch every page for one player; returns (rows, pages)"""
+    all_rows: List[Dict[str, str]] = []
     page = 1
     while True:
-        print(f"Fetching page {page}...")
-        payload = fetch_json(build_url(page))
+        print(f"{label}Fetching page {page}...")
+        payload = fetch_json(build_url(page, base_url))
         games = list(iter_games(payload))
         if not games:
             break
         all_rows.extend(extract_row(g) for g in games)
+        metrics.incr("exophase.pages")
         page += 1
         # add a small delay to avoid hitting the server too hard
-        time.sleep(3)
+        time.sleep(PAGE_DELAY)
+    return all_rows, page - 1
+
+
+def write_stats(rows: List[Dict[str, str]], changes: Dict[str, list], out_dir: str) -> None:
+    """Update the rollup state in data/ with this run's changes and render stats.json"""
+    state_path = os.path.join(out_dir, "data", "rollups.json")
+    stats_path = os.path.join(out_dir, "stats.json")
+    state = read_json(state_path, None)
+    if state is not None and not any(changes.values()) and os.path.exists(stats_path):
+        # Nothing changed: leave both files alone so the nightly job has nothing to commit
+        return
+    if state is None:
+        # First run (or state lost): baseline from every row, not just the delta
+        state = rollups.new_state()
+        changes = {"added": rows, "changed": [], "removed": []}
+    rollups.update(state, changes)
+    atomic_write_json(state, state_path, ensure_ascii=False, separators=(",", ":"))
+    atomic_write_json(rollups.render(state), stats_path, indent=2, ensure_ascii=False)
+
+
+def save_games(rows: List[Dict[str, str]], out_path: str, label: str = "") -> Dict[str, Any]:
+    """Write games.json, bump its delta manifest in data/ and update stats.json next to it"""
+    with metrics.timer("exophase.write"):
+        out_dir = os.path.dirname(out_path)
+        os.makedirs(out_dir, exist_ok=True)
+        old_rows = read_json(out_path, [])
+        write_json(rows, out_path)
+        print(f"{label}Wrote {len(rows)} rows to {out_path}")
+
+        changes = diff_rows(old_rows, rows)
+        manifest = write_delta(old_rows, rows, os.path.join(out_dir, "data"), changes)
+        print(f"{label}Data version {manifest['version']} ({manifest['hash']}), {len(manifest['deltas'])} delta(s) available")
+    with metrics.timer("exophase.rollups"):
+        write_stats(rows, changes, out_dir)
+    metrics.incr("exophase.games", len(rows))
+    return manifest
+
+
+def parse_player(spec: Any) -> Dict[str, str]:
+    """Accept "<id>", "<id>:<environment>" or {"id", "environment", "name"}"""
+    if isinstance(spec, dict):
+        player = {"id": str(spec["id"]), "environment": str(spec.get("environment") or DEFAULT_ENVIRONMENT)}
+        if spec.get("name"):
+            player["name"] = str(spec["name"])
+    else:
+        player_id, _, environment = str(spec).partition(":")
+        player = {"id": player_id.strip(), "environment": environment.strip() or DEFAULT_ENVIRONMENT}
+    player["key"] = f"{player['id']}-{player['environment']}"
+    return player
+
+
+def player_url(player: Dict[str, str]) -> str:
+    return API_URL.format(player=urllib.parse.quote(player["id"]),
+                          environment=urllib.parse.quote(player["environment"]))
+
+
+def index_entry(player: Dict[str, str], rows: List[Dict[str, str]], manifest: Dict[str, Any],
+                previous: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    entry = {**player, "count": len(rows), "version": manifest["version"],
+             "hash": manifest["hash"], "updated": int(time.time())}
+    # An unchanged shard keeps its entry (and "updated" time) so the index doesn't churn
+    if previous and all(previous.get(k) == v for k, v in entry.items() if k != "updated"):
+        return previous
+    return entry
+
+
+def write_index(out_dir: str, entries: List[Dict[str, Any]]) -> None:
+    os.makedirs(out_dir, exist_ok=True)
+    index_path = os.path.join(out_dir, "index.json")
+    if read_json(index_path, {}).get("players") == entries:
+        print(f"Index of {len(entries)} player(s) unchanged")
+        return
+    atomic_write_json({"generated": int(time.time()), "players": entries}, index_path,
+                      indent=2, ensure_ascii=False)
+    print(f"Wrote index of {len(entries)} player(s) to {index_path}")
+
+
+def scrape_players(players: List[Dict[str, str]], out_dir: str) -> int:
+    """Scrape several players concurrently into one shard per player plus an index.
+
+    Shards live at <out_dir>/<id>-<environment>/games.json (each with its own
+    delta manifest) and <out_dir>/index.json lists them for the viewer. All
+    threads share POOL's keep-alive connections and the global RATE_LIMIT.
+    """
+    previous = {p["key"]: p for p in read_json(os.path.join(out_dir, "index.json"), {}).get("players", [])}
+
+    def scrape_one(player: Dict[str, str]) -> Dict[str, Any]:
+        label = f"[{player['key']}] "
+        rows, _ = scrape_games(player_url(player), label)
+        manifest = save_games(rows, os.path.join(out_dir, player["key"], "games.json"), label)
+        return index_entry(player, rows, manifest, previous.get(player["key"]))
+
+    entries = []
+    failed = 0
+    with ThreadPoolExecutor(max_workers=min(MAX_CONCURRENCY, len(players))) as pool:
+        futures = [(p, pool.submit(scrape_one, p)) for p in players]
+        for player, future in futures:
+            try:
+                entries.append(future.result())
+            except SystemExit as e:
+                # Keep serving the last good shard for this player
+                failed += 1
+                print(f"[{player['key']}] Failed: {e}")
+                if player["key"] in previous:
+                    entries.append(previous[player["key"]])
+
+    write_index(out_dir, entries)
+    if failed:
+        print(f"{failed} of {len(players)} player(s) failed; their last good shards were kept")
+    # Only a run where nothing was scraped is an error: partial results still get published
+    return 1 if failed == len(players) else 0
+
+
+def poll_url(base_url: str, sort: str) -> str:
+    parts = urllib.parse.urlsplit(base_url)
+    query = dict(urllib.parse.parse_qsl(parts.query))
+    query["sort"] = sort
+    return urllib.parse.urlunsplit(parts._replace(query=urllib.parse.urlencode(query)))
+
+
+def merge_rows(rows: List[Dict[str, str]], fresh: List[Dict[str, str]]) -> Tuple[List[Dict[str, str]], bool]:
+    """Apply freshly polled rows onto the stored ones by title; returns (rows, changed)"""
+    position = {r.get("title", ""): i for i, r in enumerate(rows)}
+    merged = list(rows)
+    changed = False
+    for row in fresh:
+        i = position.get(row["title"])
+        if i is None:
+            position[row["title"]] = len(merged)
+            merged.append(row)
+            changed = True
+        elif merged[i] != row:
+            merged[i] = row
+            changed = True
+    return merged, changed
+
+
+def poll_target(target: Dict[str, Any], sort: str) -> bool:
+    """Poll (or fully re-scrape, when due) one target; returns True if its data changed"""
+    label = target["label"]
+    now = time.monotonic()
+    if now >= target["next_full"]:
+        rows, _ = scrape_games(target["base_url"], label)
+        target["next_full"] = now + target["full_refresh"]
+        changed = rows != target["rows"]
+        metrics.incr("daemon.full_scrapes")
+    else:
+        payload = fetch_json(build_url(1, poll_url(target["base_url"], sort)))
+        fresh = [extract_row(g) for g in iter_games(payload)]
+        played = [int(r["last_played"] or 0) for r in fresh]
+        if played != sorted(played, reverse=True) and not target["warned"]:
+            target["warned"] = True
+            print(f"{label}Warning: polled page is not ordered by last played; check --poll-sort")
+        rows, changed = merge_rows(target["rows"], fresh)
+        metrics.incr("daemon.polls")
+
+    if changed:
+        manifest = save_games(rows, target["out_path"], label)
+        target["rows"] = rows
+        target["manifest"] = manifest
+        metrics.incr("daemon.changes")
+    return changed
+
+
+def run_daemon(targets: List[Dict[str, Any]], index_dir: Optional[str] = None, sort: str = POLL_SORT,
+               min_interval: float = POLL_MIN_INTERVAL, max_interval: float = POLL_MAX_INTERVAL,
+               full_refresh: float = FULL_REFRESH_INTERVAL) -> int:
+    """Poll only the first page of each target, adapting the interval to activity.
+
+    While last_played keeps changing a target is polled every min_interval
+    seconds; each idle poll doubles its interval up to max_interval. Changes
+    are merged into the stored rows and written (atomically, with a delta)
+    only when something actually changed. A full scrape runs at start-up if
+    there is no data yet, and every full_refresh seconds after that.
+    """
+    def stop(signum: int, frame: Any) -> None:
+        raise KeyboardInterrupt
+
+    signal.signal(signal.SIGTERM, stop)
+
+    entries = {}
+    if index_dir:
+        entries = {p["key"]: p for p in read_json(os.path.join(index_dir, "index.json"), {}).get("players", [])}
+
+    now = time.monotonic()
+    for target in targets:
+        exists = os.path.exists(target["out_path"])
+        target.update(
+            rows=read_json(target["out_path"], []),
+            interval=min_interval,
+            next_poll=now,
+            next_full=now + full_refresh if exists else now,
+            full_refresh=full_refresh,
+            warned=False,
+        )
+
+    print(f"Polling {len(targets)} target(s) every {min_interval:g}-{max_interval:g}s (Ctrl+C to stop)")
+    try:
+        while True:
+            target = min(targets, key=lambda t: t["next_poll"])
+            delay = target["next_poll"] - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            try:
+                changed = poll_target(target, sort)
+            except SystemExit as e:
+                print(f"{target['label']}Poll failed: {e}")
+                changed = False
+
+            if changed:
+                target["interval"] = min_interval
+                if target.get("player"):
+                    key = target["player"]["key"]
+                    entries[key] = index_entry(target["player"], target["rows"], target["manifest"], entries.get(key))
+                    write_index(index_dir, list(entries.values()))
+            else:
+                target["interval"] = min(target["interval"] * 2, max_interval)
+            target["next_poll"] = time.monotonic() + target["interval"]
+            print(f"{target['label']}{'Changed' if changed else 'No change'}; next poll in {target['interval']:g}s")
+    except KeyboardInterrupt:
+        print("\nDaemon stopped.")
+        return 0
+
+
+def main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(description="Scrape Exophase play history into docs/")
+    parser.add_argument("out", nargs="?",
+                        help="Output games.json (single player) or shard directory (multiple players)")
+    parser.add_argument("--player", action="append", default=[], metavar="ID[:ENV]",
+                        help="Player to scrape, e.g. 4972201:nintendo (repeatable)")
+    parser.add_argument("--players-file", help="JSON list of players (\"id:env\" strings or objects)")
+    parser.add_argument("--daemon", action="store_true",
+                        help="Keep running, polling the first page at an interval that adapts to activity")
+    parser.add_argument("--min-interval", type=float, default=POLL_MIN_INTERVAL, help="Daemon: shortest poll interval (s)")
+    parser.add_argument("--max-interval", type=float, default=POLL_MAX_INTERVAL, help="Daemon: longest poll interval (s)")
+    parser.add_argument("--full-refresh", type=float, default=FULL_REFRESH_INTERVAL, help="Daemon: seconds between full scrapes")
+    parser.add_argument("--poll-sort", default=POLL_SORT, help="Daemon: API sort value that lists recently played games first")
+    args = parser.parse_args(argv[1:])
+    daemon_args = dict(sort=args.poll_sort, min_interval=args.min_interval,
+                       max_interval=args.max_interval, full_refresh=args.full_refresh)
+
+    repo_root = os.path.dirname(os.path.abspath(__file__))
+    specs = list(args.player)
+    if args.players_file:
+        specs.extend(read_json(args.players_file, []))
+
+    try:
+        if specs:
+            out_dir = os.path.join(repo_root, "docs", "players")
+            if args.out:
+                out_dir = args.out if os.path.isabs(args.out) else os.path.join(repo_root, args.out)
+            players = [parse_player(s) for s in specs]
+            if args.daemon:
+                targets = [
+                    {"label": f"[{p['key']}] ", "base_url": player_url(p), "player": p,
+                     "out_path": os.path.join(out_dir, p["key"], "games.json")}
+                    for p in players
+                ]
+                return run_daemon(targets, index_dir=out_dir, **daemon_args)
+            return scrape_players(players, out_dir)
+
+        # default to docs/games.json so GitHub Pages (docs/) serves fresh data
+        out_path = os.path.join(repo_root, "docs", "games.json")
+        if args.out:
+            out_path = args.out if os.path.isabs(args.out) else os.path.join(repo_root, args.out)
+
+        if args.daemon:
+            return run_daemon([{"label": "", "base_url": BASE_URL, "out_path": out_path}], **daemon_args)
 
-    write_json(all_rows, out_path)
-    print(f"Wrote {len(all_rows)} rows to {out_path} across {page-1} page(s)")
-    return 0
+        rows, pages = scrape_games()
+        print(f"Fetched {len(rows)} rows across {pages} page(s)")
+        save_games(rows, out_path)
+        return 0
+    finally:
+        POOL.close()
+        metrics.write_summary()
 
 
 if __name__ == "__main__":
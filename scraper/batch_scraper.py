@@ -1,7 +1,37 @@
+import glob
+import hashlib
+import heapq
 import json
 import os
 import sys
+import time
+
+# metrics.py, rollups.py and naming.py live in the repo root
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+import metrics
+from rollups import parse_playtime
+from naming import clean_name
 from nintendo_image_scraper import main as scrape_game
+import verify_images
+
+# Budgeted backfill: checkpoint of titles that failed, so they back off instead of
+# taking the top of the queue every night
+BACKFILL_STATE = 'backfill_state.json'
+RETRY_BASE = 86400  # first retry after a day, doubling per failure
+RETRY_MAX = 30 * 86400
+
+# Image availability manifest read by the viewer and serve_games.py
+MANIFEST_FILENAME = 'manifest.json'
+# Derivative directory -> filename suffix after the game's clean name
+DERIVATIVES = {
+    'square-converted': '_square.webp',
+    'square': '_square.jpg',
+    'main-converted': '_main.webp',
+    'main': '_main.jpg',
+}
 
 # Try to import PIL for image processing
 try:
@@ -60,7 +90,314 @@ def load_progress(progress_file):
         print(f"Warning: Could not load progress file: {e}")
         return set()
 
-def convert_square_images(output_dir, size=(512, 512)):
+def load_all_games(games_file):
+    """Games from games_file plus any per-player shards next to it, merged by title.
+
+    With players.json the nightly job only updates the shards, so games.json alone
+    would miss every new game.
+    """
+    files = [games_file] + sorted(glob.glob(os.path.join(os.path.dirname(games_file) or '.', 'players', '*', 'games.json')))
+    merged = {}
+    for path in files:
+        if not os.path.exists(path):
+            continue
+        for game in load_games_data(path):
+            title = game.get('title', '')
+            if not title:
+                continue
+            seen = merged.get(title)
+            # Keep the most recent play (and highest playtime) across players
+            if seen is None or (int(game.get('last_played') or 0), parse_playtime(game.get('playtime', ''))) > \
+                    (int(seen.get('last_played') or 0), parse_playtime(seen.get('playtime', ''))):
+                merged[title] = game
+    return list(merged.values())
+
+def has_images(output_dir, name):
+    # Art that fails verification is moved to rejected/, so files here are verified ones
+    return all(
+        os.path.exists(os.path.join(output_dir, subdir, f"{name}_{subdir}.jpg"))
+        for subdir in ('square', 'main')
+    )
+
+def backfill_queue(games, output_dir, processed, attempts, now=None):
+    """Heap of titles without art, most recently played (then most played) first"""
+    now = now or time.time()
+    queue = []
+    for game in games:
+        title = game.get('title', '')
+        name = clean_name(title)
+        if not title or name in processed or has_images(output_dir, name):
+            continue
+        failed = attempts.get(name)
+        if failed and now < failed['next_attempt']:
+            continue
+        last_played = int(game.get('last_played') or 0)
+        heapq.heappush(queue, (-last_played, -parse_playtime(game.get('playtime', '')), title))
+    return queue
+
+def record_failure(attempts, name, now=None):
+    now = now or time.time()
+    count = attempts.get(name, {}).get('count', 0) + 1
+    attempts[name] = {
+        'count': count,
+        'last_attempt': int(now),
+        'next_attempt': int(now + min(RETRY_MAX, RETRY_BASE * 2 ** (count - 1))),
+    }
+
+def backfill_images(games_file='games.json', output_dir='images', budget=900, workers=1, max_mem_mb=None):
+    """Scrape art for the highest-priority games that are missing it, within a time budget.
+
+    Titles are taken most recently played first, then by playtime. A title is only
+    started if the average time per title so far still fits in what's left of the
+    budget; progress and failures are checkpointed after every title so the next
+    run continues where this one stopped. Titles that fail back off exponentially.
+    """
+    deadline = time.monotonic() + budget
+    games = load_all_games(games_file)
+    if not games:
+        print("No games data found. Exiting.")
+        return 0
+
+    if not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+
+    progress_file = os.path.join(output_dir, 'processed_games.json')
+    state_file = os.path.join(output_dir, BACKFILL_STATE)
+    processed_games = load_progress(progress_file)
+    try:
+        with open(state_file, 'r', encoding='utf-8') as f:
+            attempts = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        attempts = {}
+
+    queue = backfill_queue(games, output_dir, processed_games, attempts)
+    print(f"Backfill: {len(queue)} game(s) missing images, budget {budget}s")
+    metrics.incr("backfill.queued", len(queue))
+
+    image_index = None
+    if verify_images.PIL_AVAILABLE:
+        index_path = os.path.join(output_dir, verify_images.INDEX_FILENAME)
+        if queue and not os.path.exists(index_path):
+            # The index is a local cache (fresh CI checkouts have none): build it from the
+            # existing library first so new downloads are compared against all of it
+            with metrics.timer("backfill.seed_index"):
+                verify_images.verify_all(output_dir)
+        image_index = verify_images.ImageIndex(index_path)
+
+    done = []
+    tried = 0
+    spent = 0.0
+    while queue:
+        remaining = deadline - time.monotonic()
+        estimate = spent / tried if tried else 0
+        if remaining <= 0 or estimate > remaining:
+            print(f"Budget reached with {len(queue)} game(s) left; continuing next run.")
+            break
+        _, _, title = heapq.heappop(queue)
+        name = clean_name(title)
+        print(f"\nBackfilling: {title}")
+        start = time.monotonic()
+        try:
+            with metrics.timer("images.game"):
+                result = scrape_game(title, output_dir, auto_select=True)
+        except Exception as e:
+            print(f"Error processing {title}: {e}")
+            result = None
+        spent += time.monotonic() - start
+        tried += 1
+
+        warnings = []
+        problems = verify_images.verify_game(image_index, output_dir, result, warnings) if result and image_index else []
+        if image_index and result:
+            image_index.save()
+        # Art resembling another game's is kept (demos, shared series art); only broken,
+        # too-small, placeholder or copied images are rejected
+        for warning in warnings:
+            print(f"  warning: {warning}")
+        if result and not problems and has_images(output_dir, result):
+            processed_games.add(result)
+            attempts.pop(name, None)
+            done.append(result)
+            metrics.incr("backfill.done")
+            print(f"Successfully processed: {title}")
+        else:
+            for problem in problems:
+                print(f"  - {problem}")
+            # Move rejected or partial downloads aside so the title stays queued and the
+            # image manifest doesn't list them
+            verify_images.quarantine(output_dir, result or name, image_index)
+            if image_index:
+                image_index.save()
+            record_failure(attempts, name)
+            metrics.incr("backfill.failed")
+            print(f"Failed to process: {title} (retry after {time.ctime(attempts[name]['next_attempt'])})")
+        save_progress(progress_file, processed_games)
+        with open(state_file, 'w', encoding='utf-8') as f:
+            json.dump(attempts, f, indent=2, sort_keys=True)
+
+    if done:
+        convert_square_images(output_dir, workers=workers, max_mem_mb=max_mem_mb,
+                              only={f"{name}_square.jpg" for name in done})
+    print(f"Backfill finished: {len(done)} game(s) added, {len(queue)} still queued.")
+    return len(done)
+
+def manifest_titles(games_file):
+    """Titles from games_file plus any per-player shards next to it"""
+    return sorted(g['title'] for g in load_all_games(games_file))
+
+def describe_image(path):
+    """Content hash and, with Pillow, pixel dimensions of one derivative"""
+    with open(path, 'rb') as f:
+        info = {'hash': hashlib.sha256(f.read()).hexdigest()[:10]}
+    if PIL_AVAILABLE:
+        try:
+            with Image.open(path) as img:
+                info['width'], info['height'] = img.size
+        except Exception as e:
+            print(f"Warning: Could not read {path}: {e}")
+    return info
+
+def write_image_manifest(games_file='games.json', output_dir='images'):
+    """Write images/manifest.json: for each game with art, which derivatives exist,
+    their paths (relative to output_dir), dimensions and content hashes"""
+    games = {}
+    for title in manifest_titles(games_file):
+        name = clean_name(title)
+        entry = {}
+        for subdir, suffix in DERIVATIVES.items():
+            rel = f"{subdir}/{name}{suffix}"
+            path = os.path.join(output_dir, subdir, f"{name}{suffix}")
+            if os.path.exists(path):
+                entry[subdir] = dict(file=rel, **describe_image(path))
+        if entry:
+            games[title] = entry
+
+    manifest_path = os.path.join(output_dir, MANIFEST_FILENAME)
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            previous = json.load(f).get('games')
+    except (FileNotFoundError, json.JSONDecodeError, AttributeError):
+        previous = None
+    if previous == games:
+        # Keep the old 'generated' stamp so the nightly job has nothing to commit
+        print(f"Image manifest unchanged ({len(games)} game(s))")
+        return games
+
+    with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump({'generated': int(time.time()), 'games': games}, f,
+                  ensure_ascii=False, separators=(',', ':'), sort_keys=True)
+    print(f"Wrote image manifest for {len(games)} game(s) to {manifest_path}")
+    return games
+
+def _limit_worker_memory(max_mem_mb):
+    """Cap the virtual address space (RLIMIT_AS, not RSS) of a conversion worker (POSIX only)"""
+    if not max_mem_mb:
+        return
+    try:
+        import resource
+    except ImportError:
+        return
+    limit = int(max_mem_mb) * 1024 * 1024
+    try:
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    except (ValueError, OSError) as e:
+        print(f"Warning: Could not set worker memory limit: {e}")
+
+def transcode_image(input_path, output_path, size, keep_aspect=False, quality=85):
+    """Decode an image close to the target scale and save it as WebP.
+
+    JPEG sources are opened in draft mode so libjpeg decodes straight at
+    1/2, 1/4 or 1/8 scale, and ``reducing_gap`` lets Pillow box-reduce the
+    rest of the way before the final LANCZOS pass. Only one image is held in
+    memory at a time and its buffers are released before returning.
+    """
+    img = Image.open(input_path)
+    try:
+        # Ask the decoder for the smallest scale that is still >= the target
+        img.draft('RGB', size)
+        if img.mode not in ('RGB', 'RGBA'):
+            converted = img.convert('RGBA' if 'A' in img.getbands() else 'RGB')
+            img.close()
+            img = converted
+        if keep_aspect:
+            img.thumbnail(size, Image.Resampling.LANCZOS, reducing_gap=2.0)
+            out = img
+        else:
+            out = img.resize(size, Image.Resampling.LANCZOS, reducing_gap=2.0)
+        try:
+            out.save(output_path, 'WEBP', quality=quality, method=6)
+            return out.size
+        finally:
+            if out is not img:
+                out.close()
+    finally:
+        img.close()
+
+def _transcode_job(job):
+    """Worker entry point: returns (filename, error or None, seconds)"""
+    input_path, output_path, size, keep_aspect = job
+    start = time.perf_counter()
+    try:
+        transcode_image(input_path, output_path, size, keep_aspect=keep_aspect)
+        error = None
+    except MemoryError:
+        error = "exceeded worker memory limit"
+    except Exception as e:
+        error = str(e)
+    return os.path.basename(input_path), error, time.perf_counter() - start
+
+def _record_transcode(filename, error, seconds):
+    # Workers run in other processes, so timings are recorded here in the parent
+    metrics.observe("images.transcode", seconds)
+    if error:
+        metrics.incr("images.transcode_errors")
+        print(f"Error converting {filename}: {error}")
+        return False
+    print(f"Converted: {filename}")
+    return True
+
+def convert_images(src_dir, dst_dir, size, keep_aspect=False, workers=1, max_mem_mb=None, only=None):
+    """Convert every JPEG in src_dir (or just the filenames in ``only``) to WebP in dst_dir, optionally in parallel.
+
+    Each worker handles one image at a time and is recycled after a batch of
+    images so fragmented heaps don't accumulate; ``max_mem_mb`` caps each
+    worker's virtual address space so a bad file can't push the runner into swap.
+    """
+    if not os.path.exists(src_dir):
+        print(f"Source directory not found: {src_dir}")
+        return 0
+
+    if not os.path.exists(dst_dir):
+        os.makedirs(dst_dir)
+
+    jobs = []
+    for filename in sorted(os.listdir(src_dir)):
+        if filename.endswith('.jpg') and (only is None or filename in only):
+            jobs.append((
+                os.path.join(src_dir, filename),
+                os.path.join(dst_dir, filename.replace('.jpg', '.webp')),
+                size,
+                keep_aspect,
+            ))
+
+    converted_count = 0
+    if workers > 1 and len(jobs) > 1:
+        import multiprocessing
+        with multiprocessing.Pool(
+            processes=workers,
+            initializer=_limit_worker_memory,
+            initargs=(max_mem_mb,),
+            maxtasksperchild=50,
+        ) as pool:
+            for result in pool.imap_unordered(_transcode_job, jobs):
+                converted_count += _record_transcode(*result)
+    else:
+        for job in jobs:
+            converted_count += _record_transcode(*_transcode_job(job))
+
+    return converted_count
+
+def convert_square_images(output_dir, size=(512, 512), workers=1, max_mem_mb=None, only=None):
     """Convert square images to WebP format and resize to specified dimensions"""
     if not PIL_AVAILABLE:
         print("Skipping image conversion (PIL not available)")
@@ -69,40 +406,26 @@ def convert_square_images(output_dir, size=(512, 512)):
     square_dir = os.path.join(output_dir, 'square')
     converted_dir = os.path.join(output_dir, 'square-converted')
     
-    # Create the converted directory if it doesn't exist
-    if not os.path.exists(converted_dir):
-        os.makedirs(converted_dir)
-    
-    # Check if square directory exists
-    if not os.path.exists(square_dir):
-        print(f"Square directory not found: {square_dir}")
-        return
-    
     print(f"\nConverting square images to WebP ({size[0]}x{size[1]})...")
+    converted_count = convert_images(square_dir, converted_dir, size,
+                                     workers=workers, max_mem_mb=max_mem_mb, only=only)
+    print(f"Converted {converted_count} images to WebP format in {converted_dir}")
+
+def convert_main_images(output_dir, max_size=(1280, 1280), workers=1, max_mem_mb=None):
+    """Downscale 1920px main images to WebP, preserving aspect ratio"""
+    if not PIL_AVAILABLE:
+        print("Skipping image conversion (PIL not available)")
+        return
     
-    converted_count = 0
-    for filename in os.listdir(square_dir):
-        if filename.endswith('.jpg'):
-            input_path = os.path.join(square_dir, filename)
-            output_filename = filename.replace('.jpg', '.webp')
-            output_path = os.path.join(converted_dir, output_filename)
-            
-            try:
-                # Open the image
-                with Image.open(input_path) as img:
-                    # Resize the image
-                    img_resized = img.resize(size, Image.Resampling.LANCZOS)
-                    
-                    # Save as WebP with good quality
-                    img_resized.save(output_path, 'WEBP', quality=85, method=6)
-                    converted_count += 1
-                    print(f"Converted: {filename} -> {output_filename}")
-            except Exception as e:
-                print(f"Error converting {filename}: {e}")
+    main_dir = os.path.join(output_dir, 'main')
+    converted_dir = os.path.join(output_dir, 'main-converted')
     
+    print(f"\nConverting main images to WebP (max {max_size[0]}x{max_size[1]})...")
+    converted_count = convert_images(main_dir, converted_dir, max_size, keep_aspect=True,
+                                     workers=workers, max_mem_mb=max_mem_mb)
     print(f"Converted {converted_count} images to WebP format in {converted_dir}")
 
-def process_games(games_file='games.json', output_dir='images', resume=True):
+def process_games(games_file='games.json', output_dir='images', resume=True, workers=1, max_mem_mb=None, verify=False):
     """Process all games from JSON file, skipping already processed ones"""
     # Load games data
     games = load_games_data(games_file)
@@ -116,6 +439,17 @@ def process_games(games_file='games.json', output_dir='images', resume=True):
     if not os.path.exists(output_dir):
         os.makedirs(output_dir)
     
+    # Re-queue games whose existing art is broken, duplicated or a placeholder
+    if verify:
+        warned = {}
+        flagged = verify_images.verify_all(output_dir, warned)
+        verify_images.print_report(flagged, warned)
+        print(f"Re-queued {verify_images.requeue_flagged(output_dir, flagged)} game(s) with problem images.")
+    
+    image_index = None
+    if verify_images.PIL_AVAILABLE:
+        image_index = verify_images.ImageIndex(os.path.join(output_dir, verify_images.INDEX_FILENAME))
+    
     # Track processed games
     progress_file = os.path.join(output_dir, 'processed_games.json')
     processed_games = load_progress(progress_file) if resume else set()
@@ -130,7 +464,7 @@ def process_games(games_file='games.json', output_dir='images', resume=True):
             continue
         
         # Clean title for filename comparison
-        clean_title = ''.join(c for c in title if c.isalnum() or c in (' ', '-', '_')).strip().lower().replace(' ', '_')
+        clean_title = clean_name(title)
         
         # Check if already processed
         if clean_title in processed_games:
@@ -141,10 +475,20 @@ def process_games(games_file='games.json', output_dir='images', resume=True):
         
         try:
             # Process the game (this will prompt for selection if needed)
-            result = scrape_game(title, output_dir, auto_select=False)
+            with metrics.timer("images.game"):
+                result = scrape_game(title, output_dir, auto_select=False)
             
+            # Check the new images against the index before accepting them
+            problems = verify_images.verify_game(image_index, output_dir, result) if result and image_index else []
+            if problems:
+                image_index.save()
+                print(f"Images for {title} failed verification, leaving it queued:")
+                for problem in problems:
+                    print(f"  - {problem}")
             # Mark as processed if successful
-            if result:
+            elif result:
+                if image_index:
+                    image_index.save()
                 processed_games.add(result)  # Use the actual clean name returned by the function
                 save_progress(progress_file, processed_games)
                 print(f"Successfully processed: {title}")
@@ -163,7 +507,7 @@ def process_games(games_file='games.json', output_dir='images', resume=True):
     print(f"\nFinished processing all games. {len(processed_games)} games processed in total.")
     
     # Convert square images to WebP
-    convert_square_images(output_dir)
+    convert_square_images(output_dir, workers=workers, max_mem_mb=max_mem_mb)
 
 if __name__ == "__main__":
     import argparse
@@ -172,7 +516,30 @@ if __name__ == "__main__":
     parser.add_argument("--games-file", "-g", default="games.json", help="Path to games JSON file")
     parser.add_argument("--output", "-o", default="images", help="Output directory for images")
     parser.add_argument("--no-resume", action="store_true", help="Start from beginning, ignore previous progress")
+    parser.add_argument("--workers", "-w", type=int, default=1, help="Number of parallel image conversion workers")
+    parser.add_argument("--max-mem-mb", type=int, default=None, help="Per-worker address-space cap (RLIMIT_AS) in MB for image conversion; leave headroom above the expected RSS")
+    parser.add_argument("--convert-only", action="store_true", help="Only convert already downloaded images, skip scraping")
+    parser.add_argument("--convert-main", action="store_true", help="Also convert main images to downscaled WebP")
+    parser.add_argument("--verify", action="store_true", help="Verify existing images first and re-queue broken/duplicate/placeholder art")
+    parser.add_argument("--manifest-only", action="store_true", help="Only rewrite images/manifest.json from the files on disk")
+    parser.add_argument("--backfill", action="store_true", help="Only scrape games missing images, most recently played first, within --budget")
+    parser.add_argument("--budget", type=int, default=900, help="Wall-clock budget in seconds for --backfill")
+    parser.add_argument("--metrics", default=None, help="Write a JSON timing summary to this path (default: $METRICS_OUT)")
     
     args = parser.parse_args()
     
-    process_games(args.games_file, args.output, resume=not args.no_resume)
\ No newline at end of file
+    if args.manifest_only:
+        pass
+    elif args.convert_only:
+        convert_square_images(args.output, workers=args.workers, max_mem_mb=args.max_mem_mb)
+    elif args.backfill:
+        backfill_images(args.games_file, args.output, budget=args.budget,
+                        workers=args.workers, max_mem_mb=args.max_mem_mb)
+    else:
+        process_games(args.games_file, args.output, resume=not args.no_resume,
+                      workers=args.workers, max_mem_mb=args.max_mem_mb, verify=args.verify)
+    if args.convert_main:
+        convert_main_images(args.output, workers=args.workers, max_mem_mb=args.max_mem_mb)
+    with metrics.timer("images.manifest"):
+        write_image_manifest(args.games_file, args.output)
+    metrics.write_summary(args.metrics)
\ No newline at end of file
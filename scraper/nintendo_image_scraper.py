@@ -10,8 +10,17 @@ import os
 from urllib.parse import quote_plus
 import argparse
 import re
+import sys
 import warnings
 
+# Store origin; overridable so benchmarks can point the scraper at local fixture pages
+STORE_URL = "https://www.nintendo.com"
+
+# metrics.py is shared with the top-level scripts
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import metrics
+from naming import clean_name as image_name
+
 # Suppress TensorFlow warnings and other ML-related warnings
 warnings.filterwarnings("ignore")
 os.environ['TF_CPP_MIN_LOG_LEVEL'] = '3'  # Suppress TensorFlow logging
@@ -32,6 +41,7 @@ os.environ['KMP_AFFINITY'] = 'disabled'
 os.environ['KMP_WARNINGS'] = '0'
 os.environ['KMP_SETTING'] = 'disabled'
 
+@metrics.timed("images.driver_start")
 def setup_driver():
     """Set up Chrome driver with options for headless browsing"""
     chrome_options = Options()
@@ -138,11 +148,12 @@ def handle_age_verification(driver, debug=False):
             print(f"Error handling age verification: {e}")
         return False
 
+@metrics.timed("images.search")
 def search_nintendo_store(driver, game_name, max_results=20, debug=False):
     """Search for a game on Nintendo store and return search results"""
     # Format the search URL
     search_query = quote_plus(game_name)
-    search_url = f"https://www.nintendo.com/us/search/#q={search_query}&p=1&cat=gme&sort=df"
+    search_url = f"{STORE_URL}/us/search/#q={search_query}&p=1&cat=gme&sort=df"
     
     if debug:
         print(f"Searching for: {game_name}")
@@ -283,6 +294,7 @@ def display_search_results(results):
         except ValueError:
             print("Please enter a valid number.")
 
+@metrics.timed("images.page_render")
 def get_game_page_images(driver, game_url, debug=False):
     """Navigate to game page and extract main image"""
     try:
@@ -515,6 +527,7 @@ def get_high_res_url(image_url, width=1920):
         # For other URLs, try appending width parameter
         return image_url
 
+@metrics.timed("images.download")
 def download_image(image_url, filename, debug=False):
     """Download an image from URL and save to file"""
     try:
@@ -524,7 +537,7 @@ def download_image(image_url, filename, debug=False):
         if image_url.startswith("//"):
             image_url = "https:" + image_url
         elif image_url.startswith("/"):
-            image_url = "https://www.nintendo.com" + image_url
+            image_url = STORE_URL + image_url
             
         response = requests.get(image_url, timeout=30, headers={
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
@@ -533,10 +546,12 @@ def download_image(image_url, filename, debug=False):
         
         with open(filename, 'wb') as f:
             f.write(response.content)
+        metrics.incr("images.download_bytes", len(response.content))
         if debug:
             print(f"Saved image to: {filename}")
         return True
     except Exception as e:
+        metrics.incr("images.download_errors")
         print(f"Error downloading image: {e}")
         return False
 
@@ -577,7 +592,7 @@ def main(game_name, output_dir="images", auto_select=False, debug=False):
         square_image_url = selected_result['image_url']
         
         # Clean filename
-        clean_name = re.sub(r'[^\w\s-]', '', game_name).strip().lower().replace(' ', '_')
+        clean_name = image_name(game_name)
         
         # Save square image
         if square_image_url:
@@ -594,7 +609,6 @@ def main(game_name, output_dir="images", auto_select=False, debug=False):
             main_image_url = get_game_page_images(driver, game_link, debug=debug)
         
         if main_image_url:
-            clean_name = re.sub(r'[^\w\s-]', '', game_name).strip().lower().replace(' ', '_')
             main_filename = os.path.join(main_dir, f"{clean_name}_main.jpg")
             
             # Try to get higher resolution version
@@ -629,4 +643,5 @@ if __name__ == "__main__":
     
     args = parser.parse_args()
     
-    main(args.game_name, args.output, args.auto, args.debug)
\ No newline at end of file
+    main(args.game_name, args.output, args.auto, args.debug)
+    metrics.write_summary()
\ No newline at end of file
@@ -0,0 +1,332 @@
+import hashlib
+import json
+import os
+import shutil
+import argparse
+
+# Try to import PIL for image processing
+try:
+    from PIL import Image, ImageStat
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+
+INDEX_FILENAME = 'image_index.json'
+
+# Image kinds scraped by nintendo_image_scraper, with the filename suffix and minimum size
+IMAGE_KINDS = {
+    'square': ('_square.jpg', (200, 200)),
+    'main': ('_main.jpg', (400, 200)),
+}
+
+# WebP conversions made from each kind by batch_scraper (directory, suffix)
+CONVERTED = {
+    'square': ('square-converted', '_square.webp'),
+    'main': ('main-converted', '_main.webp'),
+}
+# Rejected art is moved here, so "has images" on disk always means verified images
+REJECTED_DIR = 'rejected'
+
+# 16x16 dHash (256 bits). On the current library the closest two different pictures are
+# 29 bits apart (the Switch Online console tiles: grey controllers on the same red), while
+# resized or re-encoded copies stay within 2, so 10 leaves a margin on both sides
+HASH_SIZE = 16
+HASH_BITS = HASH_SIZE * HASH_SIZE
+# Max Hamming distance between two dHashes for them to count as the same picture
+DUPLICATE_DISTANCE = 10
+# Grayscale standard deviation below which an image is treated as a blank placeholder
+PLACEHOLDER_STDDEV = 6.0
+
+# Hashes are split into 16 bands of 16 bits; two hashes within DUPLICATE_DISTANCE (< BANDS)
+# bits of each other must agree exactly on at least one band (pigeonhole), so candidate
+# lookup is a handful of dict hits instead of a scan over every indexed image
+BANDS = 16
+BAND_BITS = HASH_BITS // BANDS
+
+def dhash(img, size=HASH_SIZE):
+    """Compute a size*size-bit difference hash for an open PIL image"""
+    img.draft('L', (size * 4, size * 4))
+    small = img.convert('L').resize((size + 1, size), Image.Resampling.BILINEAR)
+    pixels = small.tobytes()
+    small.close()
+    value = 0
+    for row in range(size):
+        for col in range(size):
+            left = pixels[row * (size + 1) + col]
+            right = pixels[row * (size + 1) + col + 1]
+            value = (value << 1) | (1 if left > right else 0)
+    return value
+
+def hamming(a, b):
+    return bin(a ^ b).count('1')
+
+def _bands(value):
+    mask = (1 << BAND_BITS) - 1
+    return [f"{i}:{(value >> (i * BAND_BITS)) & mask:04x}" for i in range(BANDS)]
+
+def _same_game(a, b):
+    """Demo/trial versions share the full game's art (captain_tsubasa_..._demo_version)"""
+    return a.startswith(f"{b}_") or b.startswith(f"{a}_")
+
+def inspect_image(path, min_size):
+    """Decode an image and return its dimensions, hash and any problems found"""
+    info = {'width': 0, 'height': 0, 'hash': None, 'sha256': None, 'problems': []}
+    try:
+        with open(path, 'rb') as f:
+            info['sha256'] = hashlib.sha256(f.read()).hexdigest()
+        # verify() catches truncated/corrupt files without a full decode
+        with Image.open(path) as img:
+            img.verify()
+        with Image.open(path) as img:
+            info['width'], info['height'] = img.size
+            img.draft('RGB', (64, 64))
+            img.load()
+            stddev = max(ImageStat.Stat(img.convert('L')).stddev)
+            info['hash'] = f"{dhash(img):0{HASH_BITS // 4}x}"
+    except Exception as e:
+        info['problems'].append(f"broken: {e}")
+        return info
+
+    if info['width'] < min_size[0] or info['height'] < min_size[1]:
+        info['problems'].append(f"too small: {info['width']}x{info['height']}")
+    if stddev < PLACEHOLDER_STDDEV:
+        info['problems'].append("placeholder: image is nearly uniform")
+    return info
+
+class ImageIndex:
+    """Persistent index of image hashes, keyed by kind and game name.
+
+    Only what was decoded from each file is stored; duplicate checks are redone against
+    the current index on every check, so they never go stale.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.output_dir = os.path.dirname(path)
+        self.entries = {kind: {} for kind in IMAGE_KINDS}
+        self.bands = {kind: {} for kind in IMAGE_KINDS}
+        self.digests = {kind: {} for kind in IMAGE_KINDS}
+        self.load()
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except Exception as e:
+            print(f"Warning: Could not load image index: {e}")
+            return
+        for kind in IMAGE_KINDS:
+            for name, entry in data.get(kind, {}).items():
+                self.entries[kind][name] = entry
+                self._add_bands(kind, name, entry)
+
+    def save(self):
+        try:
+            with open(self.path, 'w', encoding='utf-8') as f:
+                json.dump(self.entries, f, indent=2, ensure_ascii=False, sort_keys=True)
+        except Exception as e:
+            print(f"Warning: Could not save image index: {e}")
+
+    def _add_bands(self, kind, name, entry):
+        if entry.get('hash'):
+            for band in _bands(int(entry['hash'], 16)):
+                self.bands[kind].setdefault(band, set()).add(name)
+        if entry.get('sha256'):
+            self.digests[kind].setdefault(entry['sha256'], set()).add(name)
+
+    def _remove_bands(self, kind, name, entry):
+        if entry.get('hash'):
+            for band in _bands(int(entry['hash'], 16)):
+                self.bands[kind].get(band, set()).discard(name)
+        if entry.get('sha256'):
+            self.digests[kind].get(entry['sha256'], set()).discard(name)
+
+    def _live(self, kind, name):
+        """Whether an indexed image is still on disk; entries for deleted files are dropped"""
+        if os.path.exists(os.path.join(self.output_dir, kind, f"{name}{IMAGE_KINDS[kind][0]}")):
+            return True
+        self.forget(kind, name)
+        return False
+
+    def find_copy(self, kind, name, digest):
+        """Return another game whose image is byte-identical, ignoring demo/full-game pairs"""
+        for other in sorted(self.digests[kind].get(digest, set())):
+            if other != name and not _same_game(name, other) and self._live(kind, other):
+                return other
+        return None
+
+    def find_duplicate(self, kind, name, value):
+        """Return the name of another game with a near-identical image, if any"""
+        candidates = set()
+        for band in _bands(value):
+            candidates |= self.bands[kind].get(band, set())
+        for other in sorted(candidates):
+            if other == name or _same_game(name, other):
+                continue
+            other_hash = self.entries[kind][other].get('hash')
+            if other_hash and hamming(value, int(other_hash, 16)) <= DUPLICATE_DISTANCE \
+                    and self._live(kind, other):
+                return other
+        return None
+
+    def check(self, kind, name, path):
+        """Inspect one image and record it; unchanged files are answered from the index.
+
+        Returns the entry plus 'problems' (broken, too small, placeholder, or a byte-identical
+        copy of another game's art) and 'warnings' (looks like another game's art).
+        """
+        stat = os.stat(path)
+        entry = self.entries[kind].get(name)
+        if not (entry and entry.get('mtime') == int(stat.st_mtime) and entry.get('bytes') == stat.st_size
+                and 'sha256' in entry):
+            if entry:
+                self._remove_bands(kind, name, entry)
+            info = inspect_image(path, IMAGE_KINDS[kind][1])
+            entry = {
+                'mtime': int(stat.st_mtime),
+                'bytes': stat.st_size,
+                'width': info['width'],
+                'height': info['height'],
+                'hash': info['hash'],
+                'sha256': info['sha256'],
+                'problems': info['problems'],
+            }
+            self.entries[kind][name] = entry
+            self._add_bands(kind, name, entry)
+
+        problems = list(entry['problems'])
+        warnings = []
+        if entry['hash']:
+            copy = self.find_copy(kind, name, entry['sha256'])
+            duplicate = None if copy else self.find_duplicate(kind, name, int(entry['hash'], 16))
+            if copy:
+                problems.append(f"copy of {copy}")
+            elif duplicate:
+                warnings.append(f"looks like {duplicate}")
+        return dict(entry, problems=problems, warnings=warnings)
+
+    def forget(self, kind, name):
+        entry = self.entries[kind].pop(name, None)
+        if entry:
+            self._remove_bands(kind, name, entry)
+
+def verify_game(index, output_dir, name, warnings=None):
+    """Check the square and main images for one game, returns a list of problems.
+
+    Near-duplicates of other games' art aren't problems (some titles legitimately share
+    art); they're appended to warnings when a list is passed.
+    """
+    problems = []
+    for kind, (suffix, _) in IMAGE_KINDS.items():
+        path = os.path.join(output_dir, kind, f"{name}{suffix}")
+        if os.path.exists(path):
+            result = index.check(kind, name, path)
+            problems.extend(f"{kind}: {problem}" for problem in result['problems'])
+            if warnings is not None:
+                warnings.extend(f"{kind}: {warning}" for warning in result['warnings'])
+        else:
+            index.forget(kind, name)
+    return problems
+
+def verify_all(output_dir, warned=None):
+    """Verify every scraped image under output_dir, returns {game name: [problems]}.
+
+    Games with only warnings are left out; pass a dict as warned to collect those.
+    """
+    if not PIL_AVAILABLE:
+        print("Skipping image verification (PIL not available)")
+        return {}
+
+    index = ImageIndex(os.path.join(output_dir, INDEX_FILENAME))
+    names = set()
+    for kind, (suffix, _) in IMAGE_KINDS.items():
+        kind_dir = os.path.join(output_dir, kind)
+        if os.path.exists(kind_dir):
+            names.update(f[:-len(suffix)] for f in os.listdir(kind_dir) if f.endswith(suffix))
+    # Drop index entries for images that were deleted
+    for kind in IMAGE_KINDS:
+        for name in list(index.entries[kind]):
+            if name not in names:
+                index.forget(kind, name)
+
+    flagged = {}
+    for name in sorted(names):
+        warnings = []
+        problems = verify_game(index, output_dir, name, warnings)
+        if problems:
+            flagged[name] = problems
+        if warnings and warned is not None:
+            warned[name] = warnings
+    index.save()
+    return flagged
+
+def quarantine(output_dir, name, index=None):
+    """Move a game's images (and their WebP conversions) into rejected/, returns how many moved"""
+    moved = 0
+    for kind, (suffix, _) in IMAGE_KINDS.items():
+        converted_dir, converted_suffix = CONVERTED[kind]
+        for subdir, filename in ((kind, f"{name}{suffix}"), (converted_dir, f"{name}{converted_suffix}")):
+            path = os.path.join(output_dir, subdir, filename)
+            if not os.path.exists(path):
+                continue
+            target_dir = os.path.join(output_dir, REJECTED_DIR, subdir)
+            os.makedirs(target_dir, exist_ok=True)
+            shutil.move(path, os.path.join(target_dir, filename))
+            moved += 1
+        if index:
+            index.forget(kind, name)
+    return moved
+
+def requeue_flagged(output_dir, flagged):
+    """Move flagged games' images aside and drop them from batch_scraper's progress file,
+    so the next run (including the nightly backfill) scrapes them again"""
+    if not flagged:
+        return 0
+    index = ImageIndex(os.path.join(output_dir, INDEX_FILENAME))
+    for name in flagged:
+        quarantine(output_dir, name, index)
+    index.save()
+    progress_file = os.path.join(output_dir, 'processed_games.json')
+    if not os.path.exists(progress_file):
+        return len(flagged)
+    try:
+        with open(progress_file, 'r') as f:
+            processed = set(json.load(f))
+    except Exception as e:
+        print(f"Warning: Could not load progress file: {e}")
+        return 0
+    if processed & set(flagged):
+        with open(progress_file, 'w') as f:
+            json.dump(sorted(processed - set(flagged)), f)
+    return len(flagged)
+
+def print_report(flagged, warned=None):
+    if warned:
+        print(f"\n{len(warned)} game(s) with art resembling another game's (not re-queued):")
+        for name, warnings in sorted(warned.items()):
+            print(f"  {name}")
+            for warning in warnings:
+                print(f"    - {warning}")
+    if not flagged:
+        print("All images passed verification.")
+        return
+    print(f"\n{len(flagged)} game(s) with problem images:")
+    for name, problems in sorted(flagged.items()):
+        print(f"  {name}")
+        for problem in problems:
+            print(f"    - {problem}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check scraped images for broken, duplicate or placeholder art")
+    parser.add_argument("--output", "-o", default="images", help="Images directory (containing square/ and main/)")
+    parser.add_argument("--requeue", action="store_true", help="Move flagged images to rejected/ and remove the games from processed_games.json")
+
+    args = parser.parse_args()
+
+    warned = {}
+    flagged = verify_all(args.output, warned)
+    print_report(flagged, warned)
+    if args.requeue:
+        print(f"Re-queued {requeue_flagged(args.output, flagged)} game(s) for scraping.")
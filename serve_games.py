@@ -7,11 +7,336 @@ This avoids CORS issues when loading the JSON file.
 import http.server
 import socketserver
 import webbrowser
+import argparse
+import threading
+import email.utils
+import secrets
+import json
+import urllib.parse
+import time
+import mmap
 import os
 import sys
+from collections import OrderedDict
 from pathlib import Path
 
+import metrics
+
+# Requests asking for more ranges than this get the whole file instead (RFC 9110 allows ignoring Range)
+MAX_RANGES = 16
+MMAP_CACHE_ENTRIES = 256
+
+
+def parse_ranges(header, size):
+    """
+    Byte ranges from a Range header as sorted, merged (start, end) pairs with
+    inclusive ends. Returns None when the header should be ignored (malformed,
+    not bytes, too many ranges) and [] when no range is satisfiable.
+    """
+    unit, _, spec = header.partition('=')
+    if unit.strip().lower() != 'bytes' or not spec.strip():
+        return None
+    ranges = []
+    for part in spec.split(','):
+        first, dash, last = part.strip().partition('-')
+        if not dash:
+            return None
+        try:
+            if first:
+                start = int(first)
+                end = int(last) if last else max(start, size - 1)
+                if start > end:
+                    return None
+            else:
+                # Suffix range: the last N bytes
+                length = int(last)
+                if length == 0:
+                    continue
+                start, end = max(0, size - length), size - 1
+        except ValueError:
+            return None
+        if start < size:
+            ranges.append((start, min(end, size - 1)))
+    if len(ranges) > MAX_RANGES:
+        return None
+    merged = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+class MappedFiles:
+    """Small LRU of memory-mapped files, revalidated against size and mtime"""
+
+    def __init__(self, max_size, entries=MMAP_CACHE_ENTRIES):
+        self.max_size = max_size
+        self.entries = entries
+        self.files = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, path, st):
+        if not 0 < st.st_size <= self.max_size:
+            return None
+        key = (st.st_size, st.st_mtime_ns)
+        with self.lock:
+            cached = self.files.get(path)
+            if cached and cached[0] == key:
+                self.files.move_to_end(path)
+                metrics.incr("serve.mmap_hit")
+                return cached[1]
+        with open(path, 'rb') as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        with self.lock:
+            # Replaced maps are left to the GC so in-flight responses can finish with them
+            self.files[path] = (key, mapped)
+            self.files.move_to_end(path)
+            while len(self.files) > self.entries:
+                self.files.popitem(last=False)
+        metrics.incr("serve.mmap_miss")
+        return mapped
+
+
+class ImageManifest:
+    """In-memory set of the image files listed in images/manifest.json (scraper/batch_scraper.py).
+
+    Image requests not in the set are answered 404 without touching the
+    filesystem; the set is reloaded when the manifest file changes.
+    """
+
+    EXTENSIONS = ('.jpg', '.jpeg', '.png', '.webp')
+
+    def __init__(self, path, prefix='/images/'):
+        self.path = path
+        self.prefix = prefix
+        self.files = None
+        self.mtime = None
+        self.checked = 0.0
+        self.lock = threading.Lock()
+
+    def _refresh(self):
+        # At most one stat per second, however many requests come in
+        now = time.monotonic()
+        if now - self.checked < 1.0:
+            return
+        self.checked = now
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except OSError:
+            self.files, self.mtime = None, None
+            return
+        if mtime == self.mtime:
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                games = json.load(f).get('games', {})
+        except (OSError, ValueError) as e:
+            print(f"Warning: Could not load image manifest: {e}")
+            return
+        self.files = {d['file'] for entry in games.values() for d in entry.values()}
+        self.mtime = mtime
+        metrics.incr("serve.image_manifest_loads")
+
+    def missing(self, url_path):
+        """True only when the manifest is loaded and doesn't list this image"""
+        if not url_path.startswith(self.prefix) or not url_path.lower().endswith(self.EXTENSIONS):
+            return False
+        with self.lock:
+            self._refresh()
+            files = self.files
+        return files is not None and urllib.parse.unquote(url_path[len(self.prefix):]) not in files
+
+
+class FileBody:
+    """A regular file (or mapped copy) plus the byte ranges to send from it"""
+
+    def __init__(self, f, mapped, ranges, parts=None, trailer=b''):
+        self.f = f
+        self.mapped = mapped
+        self.ranges = ranges
+        # Multipart/byteranges: one header block per range, then the closing boundary
+        self.parts = parts
+        self.trailer = trailer
+
+    def send(self, handler):
+        for i, (start, end) in enumerate(self.ranges):
+            if self.parts:
+                handler.wfile.write(self.parts[i])
+            count = end - start + 1
+            if self.mapped is not None:
+                handler.wfile.write(memoryview(self.mapped)[start:end + 1])
+            else:
+                # socket.sendfile uses os.sendfile, so the kernel copies straight from the page cache
+                handler.connection.sendfile(self.f, start, count)
+            metrics.incr("serve.bytes", count)
+        if self.trailer:
+            handler.wfile.write(self.trailer)
+
+    def close(self):
+        if self.f:
+            self.f.close()
+
+
+class GamesRequestHandler(http.server.SimpleHTTPRequestHandler):
+    """Static file handler with zero-copy file bodies, Range support and per-request latency"""
+
+    # Keep-alive; every response below carries a Content-Length
+    protocol_version = "HTTP/1.1"
+
+    # Set from the command line; exposes a Prometheus text endpoint at /metrics
+    metrics_enabled = False
+    # Files up to this size are served from memory maps when set (see --mmap-max-kb)
+    mapped_files = None
+    # Known images; anything else under /images/ is a 404 without a filesystem lookup
+    image_manifest = None
+
+    def handle_one_request(self):
+        # With keep-alive, time spent waiting for the next request line is idle time, and
+        # self.command still holds the previous request's method; only count parsed requests
+        self.request_start = None
+        super().handle_one_request()
+        if self.request_start is not None and self.command:
+            metrics.observe("serve.request", time.perf_counter() - self.request_start)
+            metrics.incr(f"serve.{self.command.lower()}")
+
+    def parse_request(self):
+        # Called once the request line has arrived
+        self.request_start = time.perf_counter()
+        return super().parse_request()
+
+    def do_GET(self):
+        if self.metrics_enabled and self.path.split('?', 1)[0] == '/metrics':
+            body = metrics.prometheus_text().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.send_header('Cache-Control', 'no-store')
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        super().do_GET()
+
+    def send_error(self, code, message=None, explain=None):
+        metrics.incr(f"serve.status_{code}")
+        super().send_error(code, message, explain)
+
+    def send_head(self):
+        url_path = self.path.split('?', 1)[0].split('#', 1)[0]
+        if self.image_manifest and self.image_manifest.missing(url_path):
+            metrics.incr("serve.image_manifest_miss")
+            self.send_error(404, "File not found")
+            return None
+        # Directories, redirects and listings keep the stock behaviour
+        path = self.translate_path(self.path)
+        if url_path.endswith('/') or not os.path.isfile(path):
+            return super().send_head()
+        try:
+            f = open(path, 'rb')
+        except OSError:
+            self.send_error(404, "File not found")
+            return None
+        try:
+            return self.send_file_head(path, f)
+        except Exception:
+            f.close()
+            raise
+
+    def send_file_head(self, path, f):
+        st = os.fstat(f.fileno())
+        size = st.st_size
+        etag = f'"{st.st_mtime_ns:x}-{size:x}"'
+        last_modified = self.date_time_string(int(st.st_mtime))
+
+        if self.not_modified(etag, st.st_mtime):
+            f.close()
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Last-Modified", last_modified)
+            self.end_headers()
+            return None
+
+        ranges = None
+        if "Range" in self.headers and self.if_range_matches(etag, last_modified):
+            ranges = parse_ranges(self.headers["Range"], size)
+        if ranges == []:
+            f.close()
+            metrics.incr("serve.status_416")
+            self.send_response(416)
+            self.send_header("Content-Range", f"bytes */{size}")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return None
+
+        ctype = self.guess_type(path)
+        mapped = self.mapped_files.get(path, st) if self.mapped_files else None
+        if mapped is not None:
+            f.close()
+            f = None
+        body = FileBody(f, mapped, ranges or ([(0, size - 1)] if size else []))
+
+        if not ranges:
+            self.send_response(200)
+            self.send_header("Content-Type", ctype)
+            length = size
+        elif len(ranges) == 1:
+            start, end = ranges[0]
+            self.send_response(206)
+            self.send_header("Content-Type", ctype)
+            self.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+            length = end - start + 1
+        else:
+            boundary = secrets.token_hex(16)
+            body.parts = [
+                (f"\r\n--{boundary}\r\nContent-Type: {ctype}\r\n"
+                 f"Content-Range: bytes {start}-{end}/{size}\r\n\r\n").encode('latin-1')
+                for start, end in ranges
+            ]
+            body.trailer = f"\r\n--{boundary}--\r\n".encode('latin-1')
+            self.send_response(206)
+            self.send_header("Content-Type", f"multipart/byteranges; boundary={boundary}")
+            length = (sum(len(p) for p in body.parts) + len(body.trailer)
+                      + sum(end - start + 1 for start, end in ranges))
+        if ranges:
+            metrics.incr("serve.range_requests")
+        self.send_header("Content-Length", str(length))
+        self.send_header("Accept-Ranges", "bytes")
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", last_modified)
+        self.end_headers()
+        return body
+
+    def not_modified(self, etag, mtime):
+        if "If-None-Match" in self.headers:
+            tags = [t.strip() for t in self.headers["If-None-Match"].split(',')]
+            return etag in tags or '*' in tags
+        if "If-Modified-Since" in self.headers:
+            try:
+                since = email.utils.parsedate_to_datetime(self.headers["If-Modified-Since"])
+            except (TypeError, ValueError, IndexError, OverflowError):
+                return False
+            return since is not None and int(mtime) <= since.timestamp()
+        return False
+
+    def if_range_matches(self, etag, last_modified):
+        # A stale validator means the client's partial copy is outdated: send the whole file
+        validator = self.headers.get("If-Range")
+        return validator is None or validator.strip() in (etag, last_modified)
+
+    def copyfile(self, source, outputfile):
+        if isinstance(source, FileBody):
+            source.send(self)
+        else:
+            super().copyfile(source, outputfile)
+
 def main():
+    parser = argparse.ArgumentParser(description="Serve the games viewer from docs/")
+    parser.add_argument("--metrics", action="store_true", help="Expose request metrics at /metrics")
+    parser.add_argument("--mmap-max-kb", type=int, default=0,
+                        help="Serve files up to this size from cached memory maps (0 = off)")
+    args = parser.parse_args()
+
     # Change to the docs directory (so relative fetch('./games.json') works)
     script_dir = Path(__file__).parent
     docs_dir = script_dir / "docs"
@@ -19,10 +344,10 @@ def main():
         print("docs/ directory not found. Please create it and place index.html there.")
         return 1
     os.chdir(docs_dir)
-    
+
     # Choose port
     PORT = 8000
-    
+
     # Try to find an available port
     for port in range(8000, 8010):
         try:
@@ -34,24 +359,32 @@ def main():
     else:
         print("Could not find an available port")
         return 1
-    
+
     # Start server
-    Handler = http.server.SimpleHTTPRequestHandler
-    
+    Handler = GamesRequestHandler
+    Handler.metrics_enabled = args.metrics
+    Handler.image_manifest = ImageManifest(str(docs_dir / "images" / "manifest.json"))
+    if args.mmap_max_kb > 0:
+        Handler.mapped_files = MappedFiles(args.mmap_max_kb * 1024)
+
     print(f"Starting server at http://localhost:{PORT}")
     print(f"Serving files from: {docs_dir}")
+    if args.metrics:
+        print(f"Metrics available at http://localhost:{PORT}/metrics")
     print("\nYour games viewer will open in your browser...")
     print("Press Ctrl+C to stop the server")
-    
+
     # Open browser (serve index.html in docs/)
     webbrowser.open(f"http://localhost:{PORT}/")
-    
+
     # Start serving
     try:
-        with socketserver.TCPServer(("", PORT), Handler) as httpd:
+        # One thread per connection so a large download doesn't block other clients
+        with http.server.ThreadingHTTPServer(("", PORT), Handler) as httpd:
             httpd.serve_forever()
     except KeyboardInterrupt:
         print("\nServer stopped.")
+        metrics.print_summary()
         return 0
 
 if __name__ == "__main__":